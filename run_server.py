@@ -25,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 import uvicorn
 from src.config.settings import settings
+from src.utils.log_context import LOG_FORMAT, add_trip_context
 
 
 def setup_logging(debug: bool = False):
@@ -33,12 +34,14 @@ def setup_logging(debug: bool = False):
     
     logging.basicConfig(
         level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        format=LOG_FORMAT,
         handlers=[
             logging.StreamHandler(sys.stdout),
             logging.FileHandler('travel_planner.log')
         ]
     )
+    # The format includes the current trip_id, which this filter fills in
+    add_trip_context(logging.getLogger().handlers)
     
     # Reduce noise from external libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -46,6 +49,15 @@ def setup_logging(debug: bool = False):
     logging.getLogger("google").setLevel(logging.WARNING)
 
 
+def select_event_loop() -> str:
+    """Use uvloop for the server's event loop when it is installed."""
+    try:
+        import uvloop  # noqa: F401
+        return "uvloop"
+    except ImportError:
+        return "asyncio"
+
+
 def check_environment():
     """Check that required environment variables are set."""
     # Always required
@@ -91,6 +103,7 @@ def print_startup_info():
     print(f"Host: {settings.host}")
     print(f"Port: {settings.port}")
     print(f"Log Level: {settings.log_level}")
+    print(f"Event Loop: {select_event_loop()}")
     
     # Database info
     if settings.use_mongodb:
@@ -187,6 +200,7 @@ def main():
         "reload": args.dev,
         "reload_dirs": ["src"] if args.dev else None,
         "access_log": True,
+        "loop": select_event_loop(),
     }
     
     print(f"\n🌟 Starting server on http://{args.host}:{args.port}")
@@ -11,7 +11,7 @@ from .critique_agent import CritiqueAgent
 from .monitor_agent import MonitorAgent
 from .orchestrator_agent import OrchestratorAgent
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class AgentRegistry:
@@ -54,6 +54,21 @@ class AgentRegistry:
         
         return await agent.process_message(message)
     
+    async def send_batch(self, agent_id: str, messages: List[AgentMessage], max_concurrency: Optional[int] = None) -> List[AgentResponse]:
+        """Send several independent messages to a specific agent in one batch, at most max_concurrency at a time."""
+        agent = self.get_agent(agent_id)
+        if not agent:
+            return [
+                AgentResponse(
+                    success=False,
+                    error=f"Agent '{agent_id}' not found",
+                    agent_id="registry"
+                )
+                for _ in messages
+            ]
+        
+        return await agent.process_batch(messages, max_concurrency=max_concurrency)
+    
     def get_agent_metrics(self) -> Dict[str, Dict[str, Any]]:
         """Get performance metrics for all agents."""
         return {
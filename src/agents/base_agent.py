@@ -1,7 +1,9 @@
 import logging
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from collections import deque
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -42,6 +44,9 @@ class AgentResponse(BaseModel):
 class BaseAgent(ABC):
     """Base class for all agents in the multi-agent system."""
     
+    # Oldest messages are dropped once the history reaches this size
+    MAX_CONVERSATION_HISTORY = 1000
+    
     def __init__(self, 
                  agent_id: str, 
                  name: str, 
@@ -63,14 +68,16 @@ class BaseAgent(ABC):
         # Agent state
         self.state = {}
         self.memory = {}
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.MAX_CONVERSATION_HISTORY)
+        # Total messages ever recorded; message ids are monotonic positions in this sequence
+        self._history_seq = 0
         
         # Performance tracking
         self.execution_count = 0
         self.total_execution_time = 0
         self.error_count = 0
         
-        self.logger.info(f"Initialized agent {self.agent_id} ({self.name})")
+        self.logger.info("Initialized agent %s (%s)", self.agent_id, self.name)
     
     @abstractmethod
     async def execute(self, message: AgentMessage) -> AgentResponse:
@@ -82,15 +89,19 @@ class BaseAgent(ABC):
         """Get the agent's prompt template."""
         pass
     
-    async def process_message(self, message: AgentMessage) -> AgentResponse:
-        """Process an incoming message with error handling and performance tracking."""
+    async def process_message(self, message: AgentMessage, raise_errors: bool = False) -> AgentResponse:
+        """Process an incoming message with error handling and performance tracking.
+        
+        With raise_errors, an exception from execute is re-raised after being counted
+        instead of being returned as an error response.
+        """
         start_time = datetime.utcnow()
         
         try:
-            self.logger.debug(f"Processing message type: {message.message_type}")
+            self.logger.debug("Processing message type: %s", message.message_type)
             
             # Add to conversation history
-            self.conversation_history.append(message)
+            self._append_history(message)
             
             # Execute the agent's main logic
             response = await self.execute(message)
@@ -103,20 +114,30 @@ class BaseAgent(ABC):
             self.execution_count += 1
             self.total_execution_time += execution_time
             
-            # Add to conversation history
-            self.conversation_history.append(AgentMessage(
+            # Add to conversation history, tagged with the request's user and trip so the
+            # reply can be found by the same filters as the request
+            response_content = response.model_dump()
+            user_id = message.content.get("user_id")
+            trip_id = message.content.get("trip_id") or (response.data or {}).get("trip_id")
+            if user_id is not None:
+                response_content["user_id"] = user_id
+            if trip_id is not None:
+                response_content["trip_id"] = trip_id
+            self._append_history(AgentMessage(
                 agent_id=self.agent_id,
                 message_type="response",
-                content=response.dict(),
+                content=response_content,
                 correlation_id=message.correlation_id
             ))
             
-            self.logger.debug(f"Processed message in {execution_time}ms")
+            self.logger.debug("Processed message in %sms", execution_time)
             return response
             
         except Exception as e:
             self.error_count += 1
-            self.logger.error(f"Error processing message: {str(e)}")
+            self.logger.error("Error processing message: %s", e)
+            if raise_errors:
+                raise
             
             return AgentResponse(
                 success=False,
@@ -125,25 +146,41 @@ class BaseAgent(ABC):
                 execution_time_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000)
             )
     
+    async def process_batch(self, messages: List[AgentMessage], max_concurrency: Optional[int] = None) -> List[AgentResponse]:
+        """Process several independent messages concurrently, returning responses in order.
+        
+        At most max_concurrency messages are in flight at once when it is given.
+        """
+        if not max_concurrency:
+            return list(await asyncio.gather(*(self.process_message(message) for message in messages)))
+        
+        slots = asyncio.Semaphore(max_concurrency)
+        
+        async def process_with_slot(message: AgentMessage) -> AgentResponse:
+            async with slots:
+                return await self.process_message(message)
+        
+        return list(await asyncio.gather(*(process_with_slot(message) for message in messages)))
+    
     async def use_tool(self, tool_name: str, **kwargs) -> MCPToolResponse:
         """Use an MCP tool with validation."""
         if tool_name not in self.available_tools:
             raise ValueError(f"Tool '{tool_name}' not available to agent {self.agent_id}")
         
-        self.logger.debug(f"Using tool: {tool_name}")
+        self.logger.debug("Using tool: %s", tool_name)
         
         try:
             response = await self.tools.execute_tool(tool_name, **kwargs)
-            self.logger.debug(f"Tool {tool_name} response: {response.success}")
+            self.logger.debug("Tool %s response: %s", tool_name, response.success)
             return response
         except Exception as e:
-            self.logger.error(f"Tool {tool_name} failed: {str(e)}")
+            self.logger.error("Tool %s failed: %s", tool_name, e)
             raise
     
     def update_state(self, key: str, value: Any):
         """Update agent state."""
         self.state[key] = value
-        self.logger.debug(f"Updated state: {key}")
+        self.logger.debug("Updated state: %s", key)
     
     def get_state(self, key: str, default: Any = None) -> Any:
         """Get value from agent state."""
@@ -155,7 +192,12 @@ class BaseAgent(ABC):
             self.memory[scope] = {}
         
         self.memory[scope][key] = value
-        self.logger.debug(f"Set memory [{scope}]: {key}")
+        self.logger.debug("Set memory [%s]: %s", scope, key)
+    
+    def set_memory_bulk(self, values: Dict[str, Any], scope: str = "session"):
+        """Set several memory keys in one scope at once."""
+        self.memory.setdefault(scope, {}).update(values)
+        self.logger.debug("Set memory [%s]: %s", scope, ", ".join(values))
     
     def get_memory(self, key: str, scope: str = "session", default: Any = None) -> Any:
         """Get memory value with scope."""
@@ -169,7 +211,7 @@ class BaseAgent(ABC):
         if scope:
             if scope in self.memory:
                 del self.memory[scope]
-                self.logger.debug(f"Cleared memory scope: {scope}")
+                self.logger.debug("Cleared memory scope: %s", scope)
         else:
             self.memory.clear()
             self.logger.debug("Cleared all memory")
@@ -177,8 +219,41 @@ class BaseAgent(ABC):
     def get_conversation_history(self, limit: Optional[int] = None) -> List[AgentMessage]:
         """Get conversation history with optional limit."""
         if limit:
-            return self.conversation_history[-limit:]
-        return self.conversation_history
+            return self.get_recent(limit)
+        return list(self.conversation_history)
+    
+    def _append_history(self, message: AgentMessage):
+        """Record a message in the conversation history."""
+        self.conversation_history.append(message)
+        self._history_seq += 1
+    
+    def get_history_page(self, size: int, before: Optional[int] = None) -> Tuple[int, List[AgentMessage], bool]:
+        """Get up to size messages older than the `before` message id (newest page if None).
+        
+        Returns the id of the first message in the page, the messages in chronological
+        order, and whether older messages remain.
+        """
+        history = self.conversation_history
+        first_id = self._history_seq - len(history)
+        
+        length = len(history)
+        end = length if before is None else max(0, min(before - first_id, length))
+        start = max(0, end - size)
+        
+        if start < length - end:
+            page = list(islice(history, start, end))
+        else:
+            # Pages near the newest end are walked from the right and flipped in place
+            page = list(islice(reversed(history), length - end, length - start))
+            page.reverse()
+        
+        return first_id + start, page, start > 0
+    
+    def get_recent(self, n: int) -> List[AgentMessage]:
+        """Get the last n messages in chronological order without copying the full history."""
+        recent = list(islice(reversed(self.conversation_history), n))
+        recent.reverse()
+        return recent
     
     def clear_conversation_history(self):
         """Clear conversation history."""
@@ -230,7 +305,7 @@ class BaseAgent(ABC):
             return response
             
         except Exception as e:
-            self.logger.error(f"Error generating AI response: {str(e)}")
+            self.logger.error("Error generating AI response: %s", e)
             raise
     
     async def generate_ai_json_response(self, 
@@ -260,7 +335,7 @@ class BaseAgent(ABC):
             return response
             
         except Exception as e:
-            self.logger.error(f"Error generating AI JSON response: {str(e)}")
+            self.logger.error("Error generating AI JSON response: %s", e)
             raise
     
     async def chat_with_ai(self, 
@@ -277,12 +352,13 @@ class BaseAgent(ABC):
             return response
             
         except Exception as e:
-            self.logger.error(f"Error in AI chat: {str(e)}")
+            self.logger.error("Error in AI chat: %s", e)
             raise
     
     def _create_success_response(self, data: Dict[str, Any]) -> AgentResponse:
         """Create a successful response."""
-        return AgentResponse(
+        # The fields are already well-typed; skip validation, which would also copy data
+        return AgentResponse.model_construct(
             success=True,
             data=data,
             agent_id=self.agent_id
@@ -290,7 +366,7 @@ class BaseAgent(ABC):
     
     def _create_error_response(self, error: str) -> AgentResponse:
         """Create an error response."""
-        return AgentResponse(
+        return AgentResponse.model_construct(
             success=False,
             error=error,
             agent_id=self.agent_id
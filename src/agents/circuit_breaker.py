@@ -0,0 +1,147 @@
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+    pass
+
+
+class CircuitBreaker:
+    """Circuit breaker for calls to a single downstream dependency.
+    
+    The circuit opens when more than `failure_rate_threshold` of the calls in the
+    last `window_seconds` failed. While open, calls are rejected; after the open
+    period a single trial call is let through (half-open). A failed trial reopens
+    the circuit for twice as long, up to `max_open_seconds`.
+    """
+    
+    def __init__(self,
+                 name: str,
+                 failure_rate_threshold: float = 0.5,
+                 window_seconds: float = 10.0,
+                 min_calls: int = 4,
+                 open_seconds: float = 30.0,
+                 max_open_seconds: float = 300.0):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        
+        self.state = CircuitState.CLOSED
+        # (timestamp, failed) for calls inside the window, oldest first
+        self._calls: Deque[tuple] = deque()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._current_open_seconds = open_seconds
+        self._trial_in_flight = False
+        
+        self.attempts = 0
+        self.rejections = 0
+        self.times_opened = 0
+        self.total_open_seconds = 0.0
+    
+    async def call(self,
+                   func: Callable[..., Awaitable[Any]],
+                   *args: Any,
+                   is_failure: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Run a call through the breaker, recording exceptions and failed results."""
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        
+        try:
+            result = await func(*args)
+        except Exception:
+            self.record(failed=True)
+            raise
+        except BaseException:
+            # Cancelled: no outcome to record, but free the half-open trial slot
+            self._trial_in_flight = False
+            raise
+
+        self.record(failed=bool(is_failure and is_failure(result)))
+        return result
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, moving OPEN to HALF_OPEN when the open period is over."""
+        now = time.monotonic()
+        
+        if self.state is CircuitState.OPEN:
+            if now - self._opened_at < self._current_open_seconds:
+                self.rejections += 1
+                return False
+            self.total_open_seconds += now - self._opened_at
+            self.state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        
+        if self.state is CircuitState.HALF_OPEN:
+            # Only one trial call at a time while half-open
+            if self._trial_in_flight:
+                self.rejections += 1
+                return False
+            self._trial_in_flight = True
+        
+        self.attempts += 1
+        return True
+    
+    def record(self, failed: bool):
+        """Record the outcome of an allowed call."""
+        now = time.monotonic()
+        
+        if self.state is CircuitState.HALF_OPEN:
+            self._trial_in_flight = False
+            if failed:
+                self._open(now, min(self._current_open_seconds * 2, self.max_open_seconds))
+            else:
+                self._close()
+            return
+        
+        self._calls.append((now, failed))
+        self._failures += failed
+        self._prune(now)
+        
+        if self.state is CircuitState.CLOSED and len(self._calls) >= self.min_calls:
+            if self._failures / len(self._calls) > self.failure_rate_threshold:
+                self._open(now, self.open_seconds)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get breaker state and counters."""
+        open_seconds = self.total_open_seconds
+        if self.state is CircuitState.OPEN:
+            open_seconds += time.monotonic() - self._opened_at
+        
+        return {
+            "state": self.state.value,
+            "attempts": self.attempts,
+            "rejections": self.rejections,
+            "times_opened": self.times_opened,
+            "open_seconds": round(open_seconds, 3)
+        }
+    
+    def _open(self, now: float, open_seconds: float):
+        self.state = CircuitState.OPEN
+        self._opened_at = now
+        self._current_open_seconds = open_seconds
+        self.times_opened += 1
+    
+    def _close(self):
+        self.state = CircuitState.CLOSED
+        self._current_open_seconds = self.open_seconds
+        self._calls.clear()
+        self._failures = 0
+    
+    def _prune(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            _, failed = self._calls.popleft()
+            self._failures -= failed
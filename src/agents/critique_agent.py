@@ -91,8 +91,8 @@ class CritiqueAgent(BaseAgent):
                 return self._create_error_response("itinerary and user_profile are required")
             
             # Create objects
-            itinerary = ItineraryDay(**itinerary_data)
-            user_profile = UserProfile(**user_profile_data)
+            itinerary = ItineraryDay(**itinerary_data) if isinstance(itinerary_data, dict) else itinerary_data
+            user_profile = UserProfile(**user_profile_data) if isinstance(user_profile_data, dict) else user_profile_data
             
             # Perform comprehensive critique
             critique_result = await self._perform_comprehensive_critique(itinerary, user_profile)
@@ -118,8 +118,8 @@ class CritiqueAgent(BaseAgent):
             itinerary_data = content.get("itinerary")
             user_profile_data = content.get("user_profile")
             
-            itinerary = ItineraryDay(**itinerary_data)
-            user_profile = UserProfile(**user_profile_data)
+            itinerary = ItineraryDay(**itinerary_data) if isinstance(itinerary_data, dict) else itinerary_data
+            user_profile = UserProfile(**user_profile_data) if isinstance(user_profile_data, dict) else user_profile_data
             
             budget_analysis = await self._analyze_budget(itinerary, user_profile)
             
@@ -133,7 +133,7 @@ class CritiqueAgent(BaseAgent):
         """Check logical feasibility of itinerary."""
         try:
             itinerary_data = content.get("itinerary")
-            itinerary = ItineraryDay(**itinerary_data)
+            itinerary = ItineraryDay(**itinerary_data) if isinstance(itinerary_data, dict) else itinerary_data
             
             feasibility_analysis = await self._analyze_feasibility(itinerary)
             
@@ -149,8 +149,8 @@ class CritiqueAgent(BaseAgent):
             itinerary_data = content.get("itinerary")
             user_profile_data = content.get("user_profile")
             
-            itinerary = ItineraryDay(**itinerary_data)
-            user_profile = UserProfile(**user_profile_data)
+            itinerary = ItineraryDay(**itinerary_data) if isinstance(itinerary_data, dict) else itinerary_data
+            user_profile = UserProfile(**user_profile_data) if isinstance(user_profile_data, dict) else user_profile_data
             
             profile_analysis = await self._analyze_profile_alignment(itinerary, user_profile)
             
@@ -1,6 +1,8 @@
 import asyncio
+import heapq
 import json
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, List, Optional, Sequence
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 
@@ -10,6 +12,31 @@ from src.models.user import UserProfile
 from src.tools import MCPToolResponse
 
 
+# Place types searched for activity types without a mapping
+_DEFAULT_PLACE_TYPES = ("tourist_attraction",)
+
+# Weather conditions that rule out outdoor activities
+_BAD_WEATHER_PATTERN = re.compile("rain|storm", re.IGNORECASE)
+
+# Typical time spent per activity type, in minutes
+_ACTIVITY_DURATION_MINUTES = {
+    "dining": 90,
+    "sightseeing": 120,
+    "cultural": 150,
+    "outdoor": 180,
+    "entertainment": 120,
+    "shopping": 90,
+    "accommodation": 60,
+    "transport": 30
+}
+
+# Place result fields read when building activity suggestions
+_SUGGESTION_PLACE_FIELDS = (
+    "name", "formatted_address", "latitude", "longitude", "place_id",
+    "rating", "price_level", "opening_hours", "types", "photos"
+)
+
+
 @dataclass
 class ItineraryRequest:
     """Request structure for itinerary generation."""
@@ -34,29 +61,34 @@ class ItineraryAgent(BaseAgent):
         
         # Activity type preferences mapping
         self.activity_type_mapping = {
-            "history": [ActivityType.CULTURAL, ActivityType.SIGHTSEEING],
-            "food": [ActivityType.DINING],
-            "adventure": [ActivityType.OUTDOOR],
-            "culture": [ActivityType.CULTURAL],
-            "art": [ActivityType.CULTURAL, ActivityType.SIGHTSEEING],
-            "music": [ActivityType.ENTERTAINMENT],
-            "shopping": [ActivityType.SHOPPING],
-            "nightlife": [ActivityType.ENTERTAINMENT],
-            "nature": [ActivityType.OUTDOOR],
-            "architecture": [ActivityType.SIGHTSEEING],
-            "photography": [ActivityType.SIGHTSEEING, ActivityType.OUTDOOR]
+            "history": frozenset({ActivityType.CULTURAL, ActivityType.SIGHTSEEING}),
+            "food": frozenset({ActivityType.DINING}),
+            "adventure": frozenset({ActivityType.OUTDOOR}),
+            "culture": frozenset({ActivityType.CULTURAL}),
+            "art": frozenset({ActivityType.CULTURAL, ActivityType.SIGHTSEEING}),
+            "music": frozenset({ActivityType.ENTERTAINMENT}),
+            "shopping": frozenset({ActivityType.SHOPPING}),
+            "nightlife": frozenset({ActivityType.ENTERTAINMENT}),
+            "nature": frozenset({ActivityType.OUTDOOR}),
+            "architecture": frozenset({ActivityType.SIGHTSEEING}),
+            "photography": frozenset({ActivityType.SIGHTSEEING, ActivityType.OUTDOOR})
         }
+        # Finds every mapped keyword inside an interest in one scan; the lookahead
+        # keeps matches that overlap, like the per-keyword substring checks did
+        self._interest_keyword_pattern = re.compile(
+            "(?=(" + "|".join(map(re.escape, self.activity_type_mapping)) + "))"
+        )
         
         # Place type mapping for Google Maps
         self.place_types = {
-            ActivityType.DINING: ["restaurant", "cafe", "food"],
-            ActivityType.SIGHTSEEING: ["tourist_attraction", "museum", "park"],
-            ActivityType.CULTURAL: ["museum", "art_gallery", "historical_site"],
-            ActivityType.ENTERTAINMENT: ["entertainment", "amusement_park", "nightclub"],
-            ActivityType.SHOPPING: ["shopping_mall", "store"],
-            ActivityType.OUTDOOR: ["park", "hiking_area", "beach"],
-            ActivityType.ACCOMMODATION: ["lodging"],
-            ActivityType.TRANSPORT: ["transit_station"]
+            ActivityType.DINING: ("restaurant", "cafe", "food"),
+            ActivityType.SIGHTSEEING: ("tourist_attraction", "museum", "park"),
+            ActivityType.CULTURAL: ("museum", "art_gallery", "historical_site"),
+            ActivityType.ENTERTAINMENT: ("entertainment", "amusement_park", "nightclub"),
+            ActivityType.SHOPPING: ("shopping_mall", "store"),
+            ActivityType.OUTDOOR: ("park", "hiking_area", "beach"),
+            ActivityType.ACCOMMODATION: ("lodging",),
+            ActivityType.TRANSPORT: ("transit_station",)
         }
     
     def get_prompt_template(self) -> str:
@@ -104,16 +136,12 @@ class ItineraryAgent(BaseAgent):
             # Get weather forecast for the day
             weather_info = await self._get_weather_for_date(request.destination, request.date)
             
-            # Get location information
-            location_info = await self._get_location_info(request.destination)
-            
             # Generate activity suggestions based on user profile
             activity_suggestions = await self._generate_activity_suggestions(
                 request.user_profile, 
                 request.destination, 
                 request.date,
-                weather_info,
-                location_info
+                weather_info
             )
             
             # Create optimized itinerary
@@ -126,6 +154,7 @@ class ItineraryAgent(BaseAgent):
             return self._create_success_response({
                 "itinerary": itinerary.dict(),
                 "weather_info": weather_info,
+                "self_confidence": self._estimate_self_confidence(itinerary, request.user_profile),
                 "generation_context": {
                     "user_profile_summary": await self._get_profile_summary(request.user_profile),
                     "constraints_applied": request.constraints,
@@ -135,7 +164,7 @@ class ItineraryAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error generating itinerary: {str(e)}")
+            self.logger.error("Error generating itinerary: %s", e)
             return self._create_error_response(f"Failed to generate itinerary: {str(e)}")
     
     async def _revise_itinerary(self, content: Dict[str, Any]) -> AgentResponse:
@@ -168,7 +197,7 @@ class ItineraryAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error revising itinerary: {str(e)}")
+            self.logger.error("Error revising itinerary: %s", e)
             return self._create_error_response(f"Failed to revise itinerary: {str(e)}")
     
     async def _get_activity_suggestions(self, content: Dict[str, Any]) -> AgentResponse:
@@ -195,7 +224,7 @@ class ItineraryAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error getting activity suggestions: {str(e)}")
+            self.logger.error("Error getting activity suggestions: %s", e)
             return self._create_error_response(f"Failed to get activity suggestions: {str(e)}")
     
     async def _calculate_travel_times(self, content: Dict[str, Any]) -> AgentResponse:
@@ -232,7 +261,7 @@ class ItineraryAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error calculating travel times: {str(e)}")
+            self.logger.error("Error calculating travel times: %s", e)
             return self._create_error_response(f"Failed to calculate travel times: {str(e)}")
     
     async def _parse_itinerary_request(self, content: Dict[str, Any]) -> ItineraryRequest:
@@ -291,11 +320,11 @@ class ItineraryAgent(BaseAgent):
             if weather_response.success:
                 return weather_response.data
             else:
-                self.logger.warning(f"Weather API failed: {weather_response.error}")
+                self.logger.warning("Weather API failed: %s", weather_response.error)
                 return {"error": "Weather data unavailable"}
                 
         except Exception as e:
-            self.logger.error(f"Error getting weather: {str(e)}")
+            self.logger.error("Error getting weather: %s", e)
             return {"error": str(e)}
     
     async def _get_location_info(self, destination: str) -> Dict[str, Any]:
@@ -310,48 +339,49 @@ class ItineraryAgent(BaseAgent):
             if location_response.success and location_response.data.get("locations"):
                 return location_response.data["locations"][0]
             else:
-                self.logger.warning(f"Location search failed: {location_response.error}")
+                self.logger.warning("Location search failed: %s", location_response.error)
                 return {"error": "Location data unavailable"}
                 
         except Exception as e:
-            self.logger.error(f"Error getting location info: {str(e)}")
+            self.logger.error("Error getting location info: %s", e)
             return {"error": str(e)}
     
     async def _generate_activity_suggestions(self, 
                                            user_profile: UserProfile, 
                                            destination: str, 
                                            target_date: date,
-                                           weather_info: Dict[str, Any],
-                                           location_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                           weather_info: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate activity suggestions based on user profile and conditions."""
         suggestions = []
         
         # Determine activity types based on user interests
         preferred_activity_types = self._get_preferred_activity_types(user_profile)
         
-        # Get suggestions for each activity type
-        for activity_type in preferred_activity_types:
-            try:
-                type_suggestions = await self._find_activities_by_type(
-                    destination, 
-                    activity_type, 
-                    user_profile.preferences.dict()
-                )
-                suggestions.extend(type_suggestions)
-            except Exception as e:
-                self.logger.error(f"Error finding activities for {activity_type}: {str(e)}")
-                continue
+        # Outdoor activities are ruled out in bad weather, so don't even search for them
+        if self._is_bad_weather(weather_info):
+            preferred_activity_types = [t for t in preferred_activity_types if t != ActivityType.OUTDOOR]
         
-        # Note: Travel MCP tool removed - relying on Google Maps for activity suggestions
+        # Place types overlap across activity types (museum, park), so look up
+        # the union once and split the results per activity type afterwards
+        type_place_types = {
+            activity_type: self.place_types.get(activity_type, _DEFAULT_PLACE_TYPES)
+            for activity_type in preferred_activity_types
+        }
+        all_place_types = list(dict.fromkeys(
+            place_type for place_types in type_place_types.values() for place_type in place_types
+        ))
+        places_by_type = await self._get_nearby_places(destination, all_place_types, radius=5000)  # 5km radius
+        
+        for activity_type, place_types in type_place_types.items():
+            suggestions.extend(self._build_activity_suggestions(activity_type, place_types, places_by_type))
         
-        # Filter based on weather conditions
-        if weather_info and not weather_info.get("error"):
-            suggestions = self._filter_by_weather(suggestions, weather_info)
+        # A place found under a shared place type shows up once per activity type
+        suggestions = self._deduplicate_suggestions(suggestions)
         
-        # Sort by relevance score
-        suggestions = self._score_and_sort_suggestions(suggestions, user_profile)
+        # Note: Travel MCP tool removed - relying on Google Maps for activity suggestions
         
-        return suggestions[:20]  # Limit to top 20 suggestions
+        # Keep the top 20 suggestions by relevance score
+        return self._score_and_sort_suggestions(suggestions, user_profile, limit=20)
     
 
     
@@ -360,48 +390,70 @@ class ItineraryAgent(BaseAgent):
                                      activity_type: ActivityType, 
                                      user_preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Find activities of a specific type in the destination."""
-        suggestions = []
-        
         # Get place types for this activity type
-        place_types = self.place_types.get(activity_type, ["tourist_attraction"])
+        place_types = self.place_types.get(activity_type, _DEFAULT_PLACE_TYPES)
+        
+        places_by_type = await self._get_nearby_places(destination, place_types, radius=5000)  # 5km radius
+        
+        return self._build_activity_suggestions(activity_type, place_types, places_by_type)
+    
+    def _build_activity_suggestions(self,
+                                    activity_type: ActivityType,
+                                    place_types: Sequence[str],
+                                    places_by_type: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Turn the places found for an activity type's place types into suggestions."""
+        suggestions = []
         
         for place_type in place_types:
-            try:
-                places_response = await self.use_tool(
-                    "google_maps",
-                    action="find_nearby_places",
-                    query=destination,
-                    place_type=place_type,
-                    radius=5000  # 5km radius
-                )
-                
-                if places_response.success:
-                    places = places_response.data.get("places", [])
-                    for place in places:
-                        suggestion = {
-                            "name": place.get("name", ""),
-                            "type": activity_type.value,
-                            "location": {
-                                "name": place.get("name", ""),
-                                "address": place.get("formatted_address", ""),
-                                "latitude": place.get("latitude"),
-                                "longitude": place.get("longitude"),
-                                "place_id": place.get("place_id")
-                            },
-                            "rating": place.get("rating"),
-                            "price_level": place.get("price_level"),
-                            "opening_hours": place.get("opening_hours"),
-                            "types": place.get("types", []),
-                            "photos": place.get("photos", [])
-                        }
-                        suggestions.append(suggestion)
-                        
-            except Exception as e:
-                self.logger.error(f"Error finding {place_type} places: {str(e)}")
-                continue
+            for place in places_by_type.get(place_type, ()):
+                suggestion = {
+                    "name": place.get("name", ""),
+                    "type": activity_type.value,
+                    "location": {
+                        "name": place.get("name", ""),
+                        "address": place.get("formatted_address", ""),
+                        "latitude": place.get("latitude"),
+                        "longitude": place.get("longitude"),
+                        "place_id": place.get("place_id")
+                    },
+                    "rating": place.get("rating"),
+                    "price_level": place.get("price_level"),
+                    "opening_hours": place.get("opening_hours"),
+                    "types": place.get("types", []),
+                    "photos": place.get("photos", [])
+                }
+                suggestions.append(suggestion)
         
         return suggestions
     
+    async def _get_nearby_places(self,
+                                 destination: str,
+                                 place_types: Sequence[str],
+                                 radius: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Get nearby places by type; the maps tool serves recent lookups from its cache."""
+        # One batched lookup covers every place type
+        try:
+            places_response = await self.use_tool(
+                "google_maps",
+                action="find_nearby_places_batch",
+                query=destination,
+                place_types=place_types,
+                radius=radius,
+                fields=_SUGGESTION_PLACE_FIELDS
+            )
+        except Exception as e:
+            self.logger.error("Error finding places near %s: %s", destination, e)
+            return {}
+        
+        if not places_response.success:
+            self.logger.warning("Nearby places search failed: %s", places_response.error)
+            return {}
+        
+        for place_type, error in places_response.data.get("errors", {}).items():
+            self.logger.error("Error finding %s places: %s", place_type, error)
+        
+        return places_response.data.get("places_by_type", {})
+    
     async def _create_optimized_itinerary(self, 
                                         request: ItineraryRequest, 
                                         activity_suggestions: List[Dict[str, Any]],
@@ -479,54 +531,66 @@ class ItineraryAgent(BaseAgent):
     
     def _get_preferred_activity_types(self, user_profile: UserProfile) -> List[ActivityType]:
         """Get preferred activity types based on user profile."""
-        preferred_types = []
+        # Always include dining
+        preferred_types = {ActivityType.DINING}
         
         # Map user interests to activity types
         for interest in user_profile.preferences.interests:
-            interest_lower = interest.lower()
-            for keyword, types in self.activity_type_mapping.items():
-                if keyword in interest_lower:
-                    preferred_types.extend(types)
+            for keyword in self._interest_keyword_pattern.findall(interest.lower()):
+                preferred_types |= self.activity_type_mapping[keyword]
         
         # Add default types based on travel style
         for style in user_profile.preferences.travel_style:
             if style.value == "cultural":
-                preferred_types.extend([ActivityType.CULTURAL, ActivityType.SIGHTSEEING])
+                preferred_types.update((ActivityType.CULTURAL, ActivityType.SIGHTSEEING))
             elif style.value == "adventure":
-                preferred_types.extend([ActivityType.OUTDOOR])
+                preferred_types.add(ActivityType.OUTDOOR)
             elif style.value == "relaxation":
-                preferred_types.extend([ActivityType.DINING])
+                preferred_types.add(ActivityType.DINING)
         
-        # Always include dining
-        preferred_types.append(ActivityType.DINING)
+        return list(preferred_types)
+    
+    def _deduplicate_suggestions(self, suggestions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop repeated places, keyed by place_id or by name when there is no place_id."""
+        seen_ids = set()
+        seen_names = set()
+        unique = []
+        
+        for suggestion in suggestions:
+            place_id = suggestion["location"].get("place_id")
+            if place_id:
+                if place_id in seen_ids:
+                    continue
+                seen_ids.add(place_id)
+            else:
+                name = suggestion.get("name", "").lower()
+                if name in seen_names:
+                    continue
+                seen_names.add(name)
+            unique.append(suggestion)
         
-        # Remove duplicates and return
-        return list(set(preferred_types))
+        return unique
     
-    def _filter_by_weather(self, suggestions: List[Dict[str, Any]], weather_info: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter suggestions based on weather conditions."""
-        if weather_info.get("error"):
-            return suggestions
+    def _is_bad_weather(self, weather_info: Dict[str, Any]) -> bool:
+        """Check whether the weather rules out outdoor activities."""
+        if not weather_info or weather_info.get("error"):
+            return False
         
         # Get weather conditions
         current_weather = weather_info.get("current_weather", {})
-        condition = current_weather.get("condition", "").lower()
         precipitation = current_weather.get("precipitation", 0)
         
-        # Filter outdoor activities if weather is bad
-        if precipitation > 5 or "rain" in condition or "storm" in condition:
-            filtered = []
-            for suggestion in suggestions:
-                if suggestion["type"] in ["outdoor"]:
-                    # Skip outdoor activities in bad weather
-                    continue
-                filtered.append(suggestion)
-            return filtered
-        
-        return suggestions
+        return precipitation > 5 or _BAD_WEATHER_PATTERN.search(current_weather.get("condition", "")) is not None
     
-    def _score_and_sort_suggestions(self, suggestions: List[Dict[str, Any]], user_profile: UserProfile) -> List[Dict[str, Any]]:
-        """Score and sort suggestions based on user preferences."""
+    def _score_and_sort_suggestions(self,
+                                    suggestions: List[Dict[str, Any]],
+                                    user_profile: UserProfile,
+                                    limit: int) -> List[Dict[str, Any]]:
+        """Score suggestions based on user preferences and return the best `limit`, highest first."""
+        # Profile lookups are the same for every suggestion
+        budget_level = user_profile.budget.level.value
+        interests = [interest.lower() for interest in user_profile.preferences.interests]
+        
         for suggestion in suggestions:
             score = 0
             
@@ -536,23 +600,23 @@ class ItineraryAgent(BaseAgent):
             
             # Price level alignment
             price_level = suggestion.get("price_level", 2)
-            if user_profile.budget.level.value == "budget" and price_level <= 2:
+            if budget_level == "budget" and price_level <= 2:
                 score += 20
-            elif user_profile.budget.level.value == "luxury" and price_level >= 3:
+            elif budget_level == "luxury" and price_level >= 3:
                 score += 20
-            elif user_profile.budget.level.value == "mid-range" and price_level == 2:
+            elif budget_level == "mid-range" and price_level == 2:
                 score += 20
             
             # Interest alignment
-            suggestion_types = suggestion.get("types", [])
-            for interest in user_profile.preferences.interests:
-                if any(interest.lower() in t.lower() for t in suggestion_types):
+            suggestion_types = [t.lower() for t in suggestion.get("types", [])]
+            for interest in interests:
+                if any(interest in t for t in suggestion_types):
                     score += 15
             
             suggestion["relevance_score"] = score
         
-        # Sort by relevance score
-        return sorted(suggestions, key=lambda x: x.get("relevance_score", 0), reverse=True)
+        # Top-k selection; ties keep their original order, as with a stable sort
+        return heapq.nlargest(limit, suggestions, key=lambda x: x.get("relevance_score", 0))
     
     async def _get_travel_time(self, origin: Location, destination: Location, mode: str = "walking") -> int:
         """Get travel time between two locations."""
@@ -569,38 +633,72 @@ class ItineraryAgent(BaseAgent):
                 duration = travel_response.data.get("duration", {})
                 return duration.get("value_seconds", 0) // 60  # Convert to minutes
             else:
-                self.logger.warning(f"Travel time calculation failed: {travel_response.error}")
+                self.logger.warning("Travel time calculation failed: %s", travel_response.error)
                 return 30  # Default 30 minutes
                 
         except Exception as e:
-            self.logger.error(f"Error calculating travel time: {str(e)}")
+            self.logger.error("Error calculating travel time: %s", e)
             return 30  # Default 30 minutes
     
     def _estimate_activity_duration(self, activity_type: str) -> int:
         """Estimate activity duration in minutes."""
-        duration_map = {
-            "dining": 90,
-            "sightseeing": 120,
-            "cultural": 150,
-            "outdoor": 180,
-            "entertainment": 120,
-            "shopping": 90,
-            "accommodation": 60,
-            "transport": 30
-        }
-        return duration_map.get(activity_type, 120)
+        return _ACTIVITY_DURATION_MINUTES.get(activity_type, 120)
+    
+    def _estimate_self_confidence(self, itinerary: ItineraryDay, user_profile: UserProfile) -> float:
+        """Estimate how likely the itinerary is to pass critique, on the critique's 0-100 scale.
+        
+        Deducts for the budget, schedule and profile checks critique runs, using the
+        same limits; anything that can't be checked here counts against confidence.
+        """
+        activities = itinerary.activities
+        if not activities:
+            return 0.0
+        
+        score = 100.0
+        
+        # Budget: over the daily limit, or unknown costs the limit can't be checked against
+        daily_budget = user_profile.budget.daily_max
+        if daily_budget:
+            if itinerary.total_cost is not None and itinerary.total_cost > daily_budget:
+                score -= 30
+            elif itinerary.total_cost is None or any(a.cost is None for a in activities):
+                score -= 15
+        
+        # Schedule: day length and share of the day spent travelling
+        if activities[0].start_time and activities[-1].end_time:
+            day_minutes = (activities[-1].end_time - activities[0].start_time).total_seconds() / 60
+            if day_minutes > 12 * 60:
+                score -= 15
+        activity_minutes = sum(a.duration_minutes or 0 for a in activities)
+        travel_minutes = sum(a.travel_time_from_previous or 0 for a in activities)
+        if not activity_minutes or travel_minutes / activity_minutes > 0.4:
+            score -= 20
+        
+        # Pace: number of activities against the preferred pace
+        pace = user_profile.preferences.pace.value
+        if pace == "slow" and len(activities) > 4:
+            score -= 15
+        elif pace == "fast" and len(activities) < 5:
+            score -= 10
+        
+        # Preferences: share of the preferred activity types the day covers
+        preferred_types = set(self._get_preferred_activity_types(user_profile))
+        covered = preferred_types.intersection(a.type for a in activities)
+        score -= 20 * (1 - len(covered) / len(preferred_types))
+        
+        return round(max(score, 0.0), 1)
     
     def _generate_daily_theme(self, activities: List[Activity], user_profile: UserProfile) -> str:
         """Generate a theme for the day based on activities."""
-        activity_types = [a.type.value for a in activities]
+        activity_types = {a.type for a in activities}
         
-        if "cultural" in activity_types and "sightseeing" in activity_types:
+        if ActivityType.CULTURAL in activity_types and ActivityType.SIGHTSEEING in activity_types:
             return "Cultural Exploration"
-        elif "outdoor" in activity_types:
+        elif ActivityType.OUTDOOR in activity_types:
             return "Nature & Adventure"
-        elif "dining" in activity_types and len([a for a in activities if a.type == ActivityType.DINING]) > 1:
+        elif ActivityType.DINING in activity_types and sum(a.type == ActivityType.DINING for a in activities) > 1:
             return "Culinary Discovery"
-        elif "entertainment" in activity_types:
+        elif ActivityType.ENTERTAINMENT in activity_types:
             return "Entertainment & Nightlife"
         else:
             return "City Discovery"
@@ -654,16 +752,15 @@ class ItineraryAgent(BaseAgent):
             constraints=constraints
         )
         
-        # Generate new itinerary
-        weather_info = await self._get_weather_for_date(request.destination, request.date)
-        location_info = await self._get_location_info(request.destination)
-        
+        # Generate new itinerary, reusing the forecast fetched for the original plan of this day
+        weather_info = existing_itinerary.get("weather_forecast")
+        if not weather_info or "error" in weather_info:
+            weather_info = await self._get_weather_for_date(request.destination, request.date)
         activity_suggestions = await self._generate_activity_suggestions(
             request.user_profile,
             request.destination,
             request.date,
-            weather_info,
-            location_info
+            weather_info
         )
         
         return await self._create_optimized_itinerary(revision_request, activity_suggestions, weather_info)
@@ -1,7 +1,7 @@
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 from src.agents.base_agent import BaseAgent, AgentMessage, AgentResponse
@@ -27,6 +27,8 @@ class MonitoringSession:
     monitoring_interval: int = 300  # 5 minutes default
     last_check: Optional[datetime] = None
     active: bool = True
+    # (disruption type, affected activities) already published for this trip
+    published_disruptions: Set[Tuple[str, Tuple[str, ...]]] = field(default_factory=set)
 
 
 class MonitorAgent(BaseAgent):
@@ -44,6 +46,9 @@ class MonitorAgent(BaseAgent):
         self.monitoring_sessions: Dict[str, MonitoringSession] = {}
         self.monitoring_state = MonitoringState.IDLE
         
+        # Detected disruptions are pushed here as {"trip_id", "disruption"} when a consumer is attached
+        self.alert_queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+        
         # Monitoring parameters
         self.monitoring_config = {
             "weather_alert_threshold": {
@@ -275,6 +280,7 @@ class MonitorAgent(BaseAgent):
                 
                 # Update last check time
                 session.last_check = datetime.utcnow()
+                self._publish_disruptions(session, disruptions)
                 
                 # Add to results
                 if disruptions:
@@ -295,27 +301,57 @@ class MonitorAgent(BaseAgent):
             self.logger.error(f"Error running monitoring cycle: {str(e)}")
             return self._create_error_response(f"Failed to run monitoring cycle: {str(e)}")
     
+    def _publish_disruptions(self, session: MonitoringSession, disruptions: List[Dict[str, Any]]):
+        """Hand newly detected disruptions to the alert queue consumer, if one is attached.
+        
+        Only the monitoring cycle publishes; a disruption still present since it was
+        published (same type and affected activities) is not queued again, while one
+        that cleared is forgotten so it is published again if it recurs.
+        """
+        if self.alert_queue is None:
+            return
+        
+        keyed = []
+        for disruption in disruptions:
+            affected = disruption.get("affected_activities") or [disruption.get("affected_activity")]
+            keyed.append(((disruption.get("type"), tuple(affected)), disruption))
+        session.published_disruptions.intersection_update(key for key, _ in keyed)
+        
+        for key, disruption in keyed:
+            if key in session.published_disruptions:
+                continue
+            
+            try:
+                self.alert_queue.put_nowait({"trip_id": session.trip_id, "disruption": disruption})
+            except asyncio.QueueFull:
+                # Left unmarked so the next cycle can publish it once the consumer catches up
+                self.logger.warning(f"Alert queue full, dropping disruption for trip {session.trip_id}")
+                return
+            session.published_disruptions.add(key)
+    
     async def _detect_disruptions(self, session: MonitoringSession) -> List[Dict[str, Any]]:
         """Detect disruptions for a monitoring session."""
         disruptions = []
+        # Every disruption found in this pass shares one detection timestamp
+        detected_at = datetime.utcnow().isoformat()
         
         # Check weather disruptions
-        weather_disruptions = await self._check_weather_disruptions(session)
+        weather_disruptions = await self._check_weather_disruptions(session, detected_at)
         disruptions.extend(weather_disruptions)
         
         # Check traffic disruptions
-        traffic_disruptions = await self._check_traffic_disruptions(session)
+        traffic_disruptions = await self._check_traffic_disruptions(session, detected_at)
         disruptions.extend(traffic_disruptions)
         
         # Check venue disruptions (simplified)
-        venue_disruptions = await self._check_venue_disruptions(session)
+        venue_disruptions = await self._check_venue_disruptions(session, detected_at)
         disruptions.extend(venue_disruptions)
         
         # TODO: Add flight disruptions when flight tools are implemented
         
         return disruptions
     
-    async def _check_weather_disruptions(self, session: MonitoringSession) -> List[Dict[str, Any]]:
+    async def _check_weather_disruptions(self, session: MonitoringSession, detected_at: str) -> List[Dict[str, Any]]:
         """Check for weather-related disruptions."""
         disruptions = []
         
@@ -350,7 +386,7 @@ class MonitorAgent(BaseAgent):
                                 "description": alert.get("description", "Weather conditions may affect travel"),
                                 "affected_activity": activity.name,
                                 "location": activity.location.name,
-                                "detected_at": datetime.utcnow().isoformat(),
+                                "detected_at": detected_at,
                                 "source": "weather_monitor"
                             })
                 
@@ -363,7 +399,7 @@ class MonitorAgent(BaseAgent):
                 
                 if current_weather_response.success:
                     weather_data = current_weather_response.data.get("current_weather", {})
-                    weather_disruption = self._analyze_weather_conditions(weather_data, activity)
+                    weather_disruption = self._analyze_weather_conditions(weather_data, activity, detected_at)
                     
                     if weather_disruption:
                         disruptions.append(weather_disruption)
@@ -373,7 +409,7 @@ class MonitorAgent(BaseAgent):
         
         return disruptions
     
-    async def _check_traffic_disruptions(self, session: MonitoringSession) -> List[Dict[str, Any]]:
+    async def _check_traffic_disruptions(self, session: MonitoringSession, detected_at: str) -> List[Dict[str, Any]]:
         """Check for traffic-related disruptions."""
         disruptions = []
         
@@ -411,7 +447,7 @@ class MonitorAgent(BaseAgent):
                             "affected_activities": [current.name, next_activity.name],
                             "current_duration": current_duration,
                             "expected_duration": expected_duration,
-                            "detected_at": datetime.utcnow().isoformat(),
+                            "detected_at": detected_at,
                             "source": "traffic_monitor"
                         })
         
@@ -420,7 +456,7 @@ class MonitorAgent(BaseAgent):
         
         return disruptions
     
-    async def _check_venue_disruptions(self, session: MonitoringSession) -> List[Dict[str, Any]]:
+    async def _check_venue_disruptions(self, session: MonitoringSession, detected_at: str) -> List[Dict[str, Any]]:
         """Check for venue-related disruptions."""
         disruptions = []
         
@@ -454,7 +490,7 @@ class MonitorAgent(BaseAgent):
                                     "description": f"{activity.name} appears to be closed",
                                     "affected_activity": activity.name,
                                     "location": activity.location.name,
-                                    "detected_at": datetime.utcnow().isoformat(),
+                                    "detected_at": detected_at,
                                     "source": "venue_monitor"
                                 })
         
@@ -503,7 +539,7 @@ class MonitorAgent(BaseAgent):
         
         return severity in ["medium", "high"]
     
-    def _analyze_weather_conditions(self, weather_data: Dict[str, Any], activity: Activity) -> Optional[Dict[str, Any]]:
+    def _analyze_weather_conditions(self, weather_data: Dict[str, Any], activity: Activity, detected_at: str) -> Optional[Dict[str, Any]]:
         """Analyze weather conditions for potential disruptions."""
         config = self.monitoring_config["weather_alert_threshold"]
         
@@ -517,7 +553,7 @@ class MonitorAgent(BaseAgent):
                 "description": f"Heavy precipitation ({precipitation}mm) may affect outdoor activities",
                 "affected_activity": activity.name,
                 "location": activity.location.name if activity.location else None,
-                "detected_at": datetime.utcnow().isoformat(),
+                "detected_at": detected_at,
                 "source": "weather_monitor"
             }
         
@@ -531,7 +567,7 @@ class MonitorAgent(BaseAgent):
                 "description": f"Strong wind ({wind_speed} km/h) may affect outdoor activities",
                 "affected_activity": activity.name,
                 "location": activity.location.name if activity.location else None,
-                "detected_at": datetime.utcnow().isoformat(),
+                "detected_at": detected_at,
                 "source": "weather_monitor"
             }
         
@@ -545,7 +581,7 @@ class MonitorAgent(BaseAgent):
                 "description": f"Very cold temperature ({temperature}°C) may affect outdoor activities",
                 "affected_activity": activity.name,
                 "location": activity.location.name if activity.location else None,
-                "detected_at": datetime.utcnow().isoformat(),
+                "detected_at": detected_at,
                 "source": "weather_monitor"
             }
         
@@ -557,7 +593,7 @@ class MonitorAgent(BaseAgent):
                 "description": f"Very hot temperature ({temperature}°C) may affect outdoor activities",
                 "affected_activity": activity.name,
                 "location": activity.location.name if activity.location else None,
-                "detected_at": datetime.utcnow().isoformat(),
+                "detected_at": detected_at,
                 "source": "weather_monitor"
             }
         
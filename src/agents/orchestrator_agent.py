@@ -1,16 +1,192 @@
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, date, timedelta
-from dataclasses import dataclass
+import hashlib
+import json
+import re
+import sys
+import time
+from typing import Dict, Any, AsyncIterator, Deque, List, Optional, Tuple
+from datetime import datetime, date, timedelta, timezone
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from itertools import islice
 from enum import Enum
 
+import orjson
+
 from src.agents.base_agent import BaseAgent, AgentMessage, AgentResponse
 from src.agents.profiler_agent import ProfilerAgent
 from src.agents.itinerary_agent import ItineraryAgent
 from src.agents.critique_agent import CritiqueAgent
 from src.agents.monitor_agent import MonitorAgent
+from src.agents.session_store import SessionStore
+from src.agents.circuit_breaker import CircuitBreaker, CircuitOpenError
 from src.models.trip import Trip, TripStatus, ItineraryDay, ItineraryDayStatus, DisruptionAlert
 from src.models.user import UserProfile
+from src.utils.log_context import current_trip_id
+
+
+# Timezone-aware UTC clock used for session timestamps
+_utcnow = partial(datetime.now, timezone.utc)
+
+# Revision feedback prefixes keyed by critique issue severity
+_FEEDBACK_PREFIXES = {"high": "Critical: ", "medium": "Issue: "}
+
+# Replanning options offered for any disruption; shared, so treat as read-only
+_REPLANNING_OPTIONS = (
+    {
+        "option": "reschedule_activities",
+        "description": "Reschedule affected activities to later times",
+        "estimated_impact": "low"
+    },
+    {
+        "option": "replace_activities",
+        "description": "Replace affected activities with alternatives",
+        "estimated_impact": "medium"
+    },
+    {
+        "option": "cancel_activities",
+        "description": "Cancel affected activities and extend others",
+        "estimated_impact": "high"
+    }
+)
+
+
+# Disruption severity -> weight in the impact score
+_SEVERITY_WEIGHTS = {"low": 0.25, "medium": 0.5, "high": 0.75, "critical": 1.0}
+
+
+def _disruption_impact_score(disruption_data: Dict[str, Any]) -> float:
+    """Average per-activity impact from severity, expected duration and how far delays cascade."""
+    default_severity = _SEVERITY_WEIGHTS.get(disruption_data.get("severity", "medium"), 0.5)
+    default_duration = disruption_data.get("expected_duration") or 0
+    affected = disruption_data.get("affected_activities") or ()
+    
+    if not affected:
+        return round(0.5 * default_severity + 0.3 * min(default_duration / 120, 1.0), 3)
+    
+    # Later activities in the list are knocked on by delays to the earlier ones
+    depth_scale = 0.2 / len(affected)
+    total = 0.0
+    for depth, activity in enumerate(affected):
+        severity, duration = default_severity, default_duration
+        if isinstance(activity, dict):
+            severity = _SEVERITY_WEIGHTS.get(activity.get("severity"), default_severity)
+            duration = activity.get("expected_duration") or default_duration
+        total += 0.5 * severity + 0.3 * min(duration / 120, 1.0) + depth * depth_scale
+    
+    return round(total / len(affected), 3)
+
+
+# Handlers that don't change session state. They skip the per-user lock so status polls
+# aren't queued behind a long planning step.
+_LOCK_FREE_MESSAGE_TYPES = frozenset({
+    "get_planning_status", "get_session_status", "get_chat_history", "extract_trip_info",
+})
+
+
+@lru_cache(maxsize=1024)
+def _revision_feedback(issues: Tuple[Tuple[Optional[str], str], ...]) -> str:
+    """Join (severity, description) pairs into revision feedback."""
+    feedback_parts = [
+        _FEEDBACK_PREFIXES[severity] + description
+        for severity, description in issues
+        if severity in _FEEDBACK_PREFIXES
+    ]
+    
+    return "; ".join(feedback_parts) or "Please improve the itinerary quality"
+
+
+# Fast-path patterns for short, plain trip requests; anything richer goes to the LLM.
+# The lead only allows a few plain request openers, so negated or conditional
+# messages ("I don't want...", "If we had...") never match.
+_LEAD = (
+    r"^(?i:please\s+)?"
+    r"(?i:(?:plan|book|arrange|organi[sz]e|i\s+want|i\s+need|i'd\s+like|i\s+would\s+like)\s+(?:me\s+|us\s+)?)?"
+    r"(?i:(?:a|an|my|our)\s+)?"
+)
+_DEST = r"(?P<dest>[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*){0,3})"
+_TRIP_WORD = r"(?i:trip|vacation|holiday|getaway|visit)"
+_END = r"\s*[.!]?$"
+
+_TRIP_DURATION_PATTERNS = (
+    # "Plan a 5-day trip to Tokyo"
+    re.compile(_LEAD + r"(?P<days>\d{1,2})[- ](?i:days?)\s+" + _TRIP_WORD + r"\s+(?i:to|in)\s+" + _DEST + _END),
+    # "I want a trip to Tokyo for 5 days"
+    re.compile(_LEAD + _TRIP_WORD + r"\s+(?i:to|in)\s+" + _DEST + r"\s+(?i:for)\s+(?P<days>\d{1,2})\s+(?i:days?)" + _END),
+)
+
+# "Trip to Paris from Oct 10 to Oct 15" / "Visit Paris Oct 10 - 15"
+_TRIP_DATE_RANGE_RE = re.compile(
+    _LEAD + r"(?:" + _TRIP_WORD + r"\s+(?=(?i:to|in)\s))?(?i:to|in|visit)\s+" + _DEST + r"\s+(?:(?i:from)\s+)?"
+    r"(?P<start_month>[A-Za-z]{3,9})\.?\s+(?P<start_day>\d{1,2})\s*(?i:to|until|through|-)\s*"
+    r"(?:(?P<end_month>[A-Za-z]{3,9})\.?\s+)?(?P<end_day>\d{1,2})" + _END
+)
+
+_MONTHS = {
+    name: number
+    for number, full_name in enumerate(
+        ("january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"),
+        start=1
+    )
+    for name in (full_name, full_name[:3])
+}
+_MONTHS["sept"] = 9
+
+# Capitalized words the destination group can catch that are never places
+_NON_PLACE_WORDS = frozenset({
+    "i", "me", "my", "we", "us", "our", "you", "your", "it", "he", "she", "they", "them",
+    "the", "a", "an", "this", "that", "there", "here", "home",
+    "somewhere", "anywhere", "everywhere", "nowhere",
+})
+
+
+def _is_place_name(destination: str) -> bool:
+    """Reject destinations the fast path caught that can't be a place name."""
+    name = destination.lower()
+    return len(name) > 1 and name not in _NON_PLACE_WORDS and name not in _MONTHS
+
+# Replies that confirm the day's itinerary, matched in a single scan
+_CONFIRM_KEYWORDS = ("yes", "okay", "sure", "confirm", "approve", "good", "perfect", "looks good")
+_CONFIRM_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(keyword) for keyword in _CONFIRM_KEYWORDS) + r")\b",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def _match_trip_pattern(message: str) -> Optional[Tuple[str, int, int, int, int, int]]:
+    """Match a normalized message against the fast-path trip patterns.
+    
+    Returns (destination, duration_days, start_month, start_day, end_month, end_day),
+    with zero months/days when the message only states a duration. The result does
+    not depend on today's date so it is safe to cache.
+    """
+    for pattern in _TRIP_DURATION_PATTERNS:
+        match = pattern.match(message)
+        if match:
+            destination = match.group("dest")
+            duration_days = int(match.group("days"))
+            if not _is_place_name(destination) or not 0 < duration_days <= 30:
+                return None
+            return destination, duration_days, 0, 0, 0, 0
+    
+    match = _TRIP_DATE_RANGE_RE.match(message)
+    if match:
+        start_month = _MONTHS.get(match.group("start_month").lower())
+        end_month = _MONTHS.get((match.group("end_month") or match.group("start_month")).lower())
+        if start_month and end_month and _is_place_name(match.group("dest")):
+            return (match.group("dest"), 0, start_month, int(match.group("start_day")),
+                    end_month, int(match.group("end_day")))
+    
+    return None
+
+
+def _itinerary_digest(itinerary: Dict[str, Any]) -> str:
+    """Stable content hash of an itinerary, used to reuse critique results."""
+    encoded = json.dumps(itinerary, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
 
 
 class PlanningState(str, Enum):
@@ -25,7 +201,21 @@ class PlanningState(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class WorkflowConfig:
+    """Workflow settings for the planning loop."""
+    max_revision_cycles: int = 3
+    # Above the 0-100 self-confidence scale, so auto-approval stays off until the
+    # itinerary agent's estimate is calibrated against critique results
+    auto_approve_threshold: int = 101
+    max_planning_time_minutes: int = 30
+    sub_agent_timeout_seconds: int = 120
+    enable_auto_monitoring: bool = True
+    confirmation_timeout_minutes: int = 60
+    max_concurrent_days: int = 4
+
+
+@dataclass(slots=True)
 class PlanningSession:
     """Planning session for a trip."""
     trip_id: str
@@ -35,9 +225,102 @@ class PlanningSession:
     total_days: int
     user_profile: Optional[UserProfile] = None
     trip_data: Optional[Trip] = None
+    trip_payload: Optional[Dict[str, Any]] = None
+    current_itinerary: Optional[Dict[str, Any]] = None
     context: Optional[Dict[str, Any]] = None
-    created_at: datetime = datetime.utcnow()
-    updated_at: datetime = datetime.utcnow()
+    # Parsed trip dates; context keeps the ISO strings for serialization
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    created_at: datetime = field(default_factory=_utcnow)
+    # Defaults to created_at, so a new session reads the clock once
+    updated_at: Optional[datetime] = None
+    critique_cache: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    prefetched_days: Dict[int, "asyncio.Task[AgentResponse]"] = field(default_factory=dict, repr=False)
+    progress_scale: float = field(init=False, default=0.0)
+    progress: float = field(init=False, default=0.0)
+    _created_at_iso: Optional[Tuple[datetime, str]] = field(init=False, default=None, repr=False)
+    _updated_at_iso: Optional[Tuple[datetime, str]] = field(init=False, default=None, repr=False)
+    _status_view: Optional[Dict[str, Any]] = field(init=False, default=None, repr=False)
+    _status_view_key: Optional[Tuple[Any, ...]] = field(init=False, default=None, repr=False)
+    _day_dates_iso: Optional[List[str]] = field(init=False, default=None, repr=False)
+    _planning_status_skeleton: Optional[Dict[str, Any]] = field(init=False, default=None, repr=False)
+    
+    def __post_init__(self):
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+        
+        # Percent per planned day, guarded against zero-length trips
+        self.progress_scale = 100.0 / max(self.total_days, 1)
+        self.progress = self.current_day * self.progress_scale
+    
+    def day_date_iso(self, day_number: int) -> str:
+        """ISO date of a trip day (1-based), computed once for the whole trip."""
+        if self._day_dates_iso is None:
+            self._day_dates_iso = [
+                (self.start_date + timedelta(days=offset)).isoformat()
+                for offset in range(max(self.total_days, 1))
+            ]
+        if 1 <= day_number <= len(self._day_dates_iso):
+            return self._day_dates_iso[day_number - 1]
+        return (self.start_date + timedelta(days=day_number - 1)).isoformat()
+    
+    def cancel_prefetch(self):
+        """Cancel itinerary generation started ahead of time for upcoming days."""
+        for task in self.prefetched_days.values():
+            task.cancel()
+        self.prefetched_days.clear()
+    
+    def set_current_day(self, day_number: int):
+        """Move to a day and update the planning progress."""
+        self.current_day = day_number
+        self.progress = day_number * self.progress_scale
+    
+    def created_at_iso(self) -> str:
+        """ISO form of created_at, formatted once."""
+        if self._created_at_iso is None or self._created_at_iso[0] is not self.created_at:
+            self._created_at_iso = (self.created_at, self.created_at.isoformat())
+        return self._created_at_iso[1]
+    
+    def updated_at_iso(self) -> str:
+        """ISO form of updated_at, reformatted only after the session is updated."""
+        if self._updated_at_iso is None or self._updated_at_iso[0] is not self.updated_at:
+            self._updated_at_iso = (self.updated_at, self.updated_at.isoformat())
+        return self._updated_at_iso[1]
+    
+    def status_view(self) -> Dict[str, Any]:
+        """Chat status payload, rebuilt only when the session's state, day or update time changes."""
+        key = (self.state, self.current_day, self.updated_at)
+        if self._status_view is None or self._status_view_key != key:
+            self._status_view = {
+                "status": "active",
+                "trip_id": self.trip_id,
+                "state": self.state.value,
+                "current_day": self.current_day,
+                "total_days": self.total_days,
+                "progress": self.progress,
+                "created_at": self.created_at_iso(),
+                "updated_at": self.updated_at_iso(),
+                "destination": self.context.get("destination") if self.context else None
+            }
+            self._status_view_key = key
+        return self._status_view
+    
+    def planning_status(self) -> Dict[str, Any]:
+        """Planning status payload; fields fixed for the session are built once and only the rest is filled in per call."""
+        if self._planning_status_skeleton is None:
+            self._planning_status_skeleton = {
+                "trip_id": self.trip_id,
+                "total_days": self.total_days,
+                "created_at": self.created_at_iso(),
+                "context": self.context
+            }
+        return {
+            **self._planning_status_skeleton,
+            "state": self.state.value,
+            "current_day": self.current_day,
+            "progress": self.progress,
+            "updated_at": self.updated_at_iso()
+        }
 
 
 class OrchestratorAgent(BaseAgent):
@@ -57,16 +340,55 @@ class OrchestratorAgent(BaseAgent):
         self.critique = CritiqueAgent()
         self.monitor = MonitorAgent()
         
-        # Active planning sessions
-        self.planning_sessions: Dict[str, PlanningSession] = {}
+        # Per-user locks so session state transitions run one message at a time, with the
+        # number of messages holding or waiting on each so idle locks can be dropped
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._session_lock_users: Dict[str, int] = {}
+        
+        # (monotonic time, date) of the last clock read used for trip parsing
+        self._today_cache: Tuple[float, Optional[date]] = (0.0, None)
         
         # Workflow configuration
-        self.workflow_config = {
-            "max_revision_cycles": 3,
-            "auto_approve_threshold": 85,
-            "max_planning_time_minutes": 30,
-            "enable_auto_monitoring": True,
-            "confirmation_timeout_minutes": 60
+        self.workflow_config = WorkflowConfig()
+        
+        # Active planning sessions; idle ones expire after the confirmation timeout
+        self.session_store = SessionStore(
+            default_ttl_seconds=self.workflow_config.confirmation_timeout_minutes * 60,
+            on_remove=PlanningSession.cancel_prefetch
+        )
+        
+        # Bounds itinerary generations running at once, including days generated ahead
+        self._day_generation_slots = asyncio.Semaphore(self.workflow_config.max_concurrent_days)
+        
+        # Recent sub-agent round-trips as (trip_id, agent_id, elapsed_ms)
+        self.call_timings: Deque[Tuple[str, str, float]] = deque(maxlen=1000)
+        
+        # One circuit breaker per sub-agent so a failing agent is not hammered with retries
+        self._breakers = {
+            agent.agent_id: CircuitBreaker(agent.agent_id)
+            for agent in (self.profiler, self.itinerary, self.critique, self.monitor)
+        }
+        
+        # Disruptions pushed by the monitor, handled as they arrive instead of polled for
+        self._disruption_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=1000)
+        self._disruption_consumer: Optional["asyncio.Task[None]"] = None
+        self.monitor.alert_queue = self._disruption_queue
+        
+        # Message type -> handler, bound once
+        self._handlers = {
+            "start_trip_planning": self._start_trip_planning,
+            "continue_planning": self._continue_planning,
+            "confirm_day": self._confirm_day,
+            "request_revision": self._request_revision,
+            "start_trip_monitoring": self._start_trip_monitoring,
+            "handle_disruption": self._handle_disruption,
+            "get_planning_status": self._get_planning_status,
+            "cancel_planning": self._cancel_planning,
+            # Chat-related message types
+            "get_session_status": self._get_session_status,
+            "reset_session": self._reset_session,
+            "get_chat_history": self._get_chat_history,
+            "extract_trip_info": self._extract_trip_info
         }
     
     def get_prompt_template(self) -> str:
@@ -91,38 +413,107 @@ class OrchestratorAgent(BaseAgent):
     async def execute(self, message: AgentMessage) -> AgentResponse:
         """Execute the orchestrator agent's functionality."""
         message_type = message.message_type
+        if isinstance(message_type, str):
+            # Interned locally so the handler-table lookup hits the identity fast path
+            message_type = sys.intern(message_type)
         content = message.content
         
-        if message_type == "start_trip_planning":
-            return await self._start_trip_planning(content)
-        elif message_type == "continue_planning":
-            return await self._continue_planning(content)
-        elif message_type == "confirm_day":
-            return await self._confirm_day(content)
-        elif message_type == "request_revision":
-            return await self._request_revision(content)
-        elif message_type == "start_trip_monitoring":
-            return await self._start_trip_monitoring(content)
-        elif message_type == "handle_disruption":
-            return await self._handle_disruption(content)
-        elif message_type == "get_planning_status":
-            return await self._get_planning_status(content)
-        elif message_type == "cancel_planning":
-            return await self._cancel_planning(content)
-        # Chat-related message types
-        elif message_type == "get_session_status":
-            return await self._get_session_status(content)
-        elif message_type == "reset_session":
-            return await self._reset_session(content)
-        elif message_type == "get_chat_history":
-            return await self._get_chat_history(content)
-        elif message_type == "extract_trip_info":
-            return await self._extract_trip_info(content)
-        else:
+        # Tag log records emitted while handling this message with its trip
+        trip_token = current_trip_id.set(content.get("trip_id"))
+        try:
+            if message_type in _LOCK_FREE_MESSAGE_TYPES:
+                return await self._dispatch(message_type, content)
+            
+            lock_key = self._session_lock_key(content)
+            if lock_key is None:
+                return await self._dispatch(message_type, content)
+            
+            # Messages for the same user's sessions are processed in arrival order
+            lock = self._session_locks.setdefault(lock_key, asyncio.Lock())
+            self._session_lock_users[lock_key] = self._session_lock_users.get(lock_key, 0) + 1
+            try:
+                async with lock:
+                    return await self._dispatch(message_type, content)
+            finally:
+                # Drop the lock once nothing holds or waits on it
+                remaining = self._session_lock_users[lock_key] - 1
+                if remaining:
+                    self._session_lock_users[lock_key] = remaining
+                else:
+                    del self._session_lock_users[lock_key]
+                    del self._session_locks[lock_key]
+        finally:
+            current_trip_id.reset(trip_token)
+    
+    def _session_lock_key(self, content: Dict[str, Any]) -> Optional[str]:
+        """Resolve the key used to serialize messages touching the same sessions."""
+        trip_id = content.get("trip_id")
+        if trip_id:
+            session = self.session_store.get(trip_id)
+            if session:
+                return session.user_id
+        return content.get("user_id")
+    
+    async def _dispatch(self, message_type: str, content: Dict[str, Any]) -> AgentResponse:
+        """Route a message to its handler."""
+        handler = self._handlers.get(message_type)
+        if handler is None:
             print("="*100)
             print(message_type)
             print("="*100)
             return self._create_error_response(f"Unknown message type: {message_type}")
+        
+        return await handler(content)
+    
+    async def _call_agent(self, session: PlanningSession, agent: BaseAgent, message: AgentMessage) -> AgentResponse:
+        """Send a message to a sub-agent and record how long the round-trip took.
+        
+        Only timeouts and exceptions count against the agent's circuit breaker; an error
+        response is the agent rejecting one request (bad input, unknown trip) and is
+        returned as is. Timeouts and exceptions are turned into error responses here.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self._breakers[agent.agent_id].call(self._send_to_agent, agent, message)
+        except TimeoutError:
+            self.logger.warning("%s timed out on %s", agent.agent_id, message.message_type)
+            response = self._create_error_response(f"{agent.agent_id} agent timed out")
+        except CircuitOpenError:
+            response = self._create_error_response(f"{agent.agent_id} agent is temporarily unavailable")
+        except Exception as e:
+            response = AgentResponse(success=False, error=str(e), agent_id=agent.agent_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.call_timings.append((session.trip_id, agent.agent_id, elapsed_ms))
+            self.logger.debug("%s %s took %.1fms", session.trip_id, agent.agent_id, elapsed_ms)
+        
+        return response
+    
+    async def _send_to_agent(self, agent: BaseAgent, message: AgentMessage) -> AgentResponse:
+        """Send a message to a sub-agent within the per-call time budget, raising on timeout or agent error."""
+        async with asyncio.timeout(self.workflow_config.sub_agent_timeout_seconds):
+            return await agent.process_message(message, raise_errors=True)
+    
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """Get orchestrator metrics, including recent sub-agent round-trip times."""
+        metrics = super().get_performance_metrics()
+        
+        per_agent: Dict[str, List[float]] = {}
+        for _, agent_id, elapsed_ms in self.call_timings:
+            per_agent.setdefault(agent_id, []).append(elapsed_ms)
+        
+        metrics["sub_agent_calls"] = {
+            agent_id: {
+                "count": len(timings),
+                "average_ms": sum(timings) / len(timings),
+                "max_ms": max(timings)
+            }
+            for agent_id, timings in per_agent.items()
+        }
+        metrics["circuit_breakers"] = {
+            agent_id: breaker.metrics() for agent_id, breaker in self._breakers.items()
+        }
+        return metrics
     
     async def _start_trip_planning(self, content: Dict[str, Any]) -> AgentResponse:
         """Start the trip planning process."""
@@ -146,7 +537,7 @@ class OrchestratorAgent(BaseAgent):
             duration_days = trip_info.get("duration_days", 1)
             
             # Generate trip ID
-            trip_id = f"trip_{user_id}_{int(datetime.utcnow().timestamp())}"
+            trip_id = f"trip_{user_id}_{int(time.time())}"
             
             # Create planning session
             session = PlanningSession(
@@ -160,11 +551,13 @@ class OrchestratorAgent(BaseAgent):
                     "start_date": start_date.isoformat(),
                     "end_date": end_date.isoformat(),
                     "duration_days": duration_days
-                }
+                },
+                start_date=start_date,
+                end_date=end_date
             )
             
             # Store session
-            self.planning_sessions[trip_id] = session
+            self.session_store.set(session)
             
             # Check if user profile exists
             existing_profile = self.get_memory(f"user_profile_{user_id}", scope="user")
@@ -181,7 +574,7 @@ class OrchestratorAgent(BaseAgent):
                 return await self._start_profiling(session)
             
         except Exception as e:
-            self.logger.error(f"Error starting trip planning: {str(e)}")
+            self.logger.error("Error starting trip planning: %s", e)
             return self._create_error_response(f"Failed to start trip planning: {str(e)}")
     
     async def _start_profiling(self, session: PlanningSession) -> AgentResponse:
@@ -194,7 +587,7 @@ class OrchestratorAgent(BaseAgent):
                 content={"user_id": session.user_id}
             )
             
-            profiler_response = await self.profiler.process_message(profiler_message)
+            profiler_response = await self._call_agent(session, self.profiler, profiler_message)
             
             if profiler_response.success:
                 return self._create_success_response({
@@ -208,7 +601,7 @@ class OrchestratorAgent(BaseAgent):
                 return self._create_error_response(f"Profiling failed: {profiler_response.error}")
                 
         except Exception as e:
-            self.logger.error(f"Error starting profiling: {str(e)}")
+            self.logger.error("Error starting profiling: %s", e)
             return self._create_error_response(f"Failed to start profiling: {str(e)}")
     
     async def _continue_planning(self, content: Dict[str, Any]) -> AgentResponse:
@@ -220,22 +613,20 @@ class OrchestratorAgent(BaseAgent):
             
             # If no trip_id, try to find active session for user
             if not trip_id:
-                for session in self.planning_sessions.values():
-                    if session.user_id == user_id:
-                        trip_id = session.trip_id
-                        break
+                active_session = self.session_store.first_for_user(user_id)
+                if active_session:
+                    trip_id = active_session.trip_id
             
-            if not trip_id or trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 # No active session, try to start new planning
                 return await self._start_trip_planning(content)
             
-            session = self.planning_sessions[trip_id]
-            
-            if session.state == PlanningState.PROFILING:
+            if session.state is PlanningState.PROFILING:
                 return await self._continue_profiling(session, content)
-            elif session.state == PlanningState.PLANNING:
+            elif session.state is PlanningState.PLANNING:
                 return await self._continue_daily_planning(session, content)
-            elif session.state == PlanningState.CONFIRMING:
+            elif session.state is PlanningState.CONFIRMING:
                 return await self._handle_confirmation(session, content)
             else:
                 return self._create_success_response({
@@ -245,7 +636,7 @@ class OrchestratorAgent(BaseAgent):
                 })
                 
         except Exception as e:
-            self.logger.error(f"Error continuing planning: {str(e)}")
+            self.logger.error("Error continuing planning: %s", e)
             return self._create_error_response(f"Failed to continue planning: {str(e)}")
     
     async def _continue_profiling(self, session: PlanningSession, content: Dict[str, Any]) -> AgentResponse:
@@ -262,7 +653,7 @@ class OrchestratorAgent(BaseAgent):
                 content={"response": user_response}
             )
             
-            profiler_response = await self.profiler.process_message(profiler_message)
+            profiler_response = await self._call_agent(session, self.profiler, profiler_message)
             
             if profiler_response.success:
                 if profiler_response.data.get("onboarding_complete"):
@@ -286,58 +677,133 @@ class OrchestratorAgent(BaseAgent):
                 return self._create_error_response(f"Profiling failed: {profiler_response.error}")
                 
         except Exception as e:
-            self.logger.error(f"Error continuing profiling: {str(e)}")
+            self.logger.error("Error continuing profiling: %s", e)
             return self._create_error_response(f"Failed to continue profiling: {str(e)}")
     
     async def _start_daily_planning(self, session: PlanningSession) -> AgentResponse:
         """Start daily planning process."""
         try:
             session.state = PlanningState.PLANNING
-            session.current_day = 1
-            session.updated_at = datetime.utcnow()
+            session.set_current_day(1)
+            session.updated_at = _utcnow()
             
             # Start planning Day 1
             return await self._plan_day(session, 1)
             
         except Exception as e:
-            self.logger.error(f"Error starting daily planning: {str(e)}")
+            self.logger.error("Error starting daily planning: %s", e)
             return self._create_error_response(f"Failed to start daily planning: {str(e)}")
     
+    async def _generate_day(self, session: PlanningSession, day_number: int) -> AgentResponse:
+        """Generate the itinerary for a day with the Itinerary agent."""
+        itinerary_message = AgentMessage(
+            agent_id="orchestrator",
+            message_type="generate_itinerary",
+            content={
+                "user_profile": session.user_profile,
+                "destination": session.context["destination"],
+                "date": session.day_date_iso(day_number),
+                "day_index": day_number
+            }
+        )
+        
+        async with self._day_generation_slots:
+            return await self._call_agent(session, self.itinerary, itinerary_message)
+    
+    def _prefetch_day(self, session: PlanningSession, day_number: int):
+        """Start generating a later day in the background while the current one is reviewed."""
+        if day_number > session.total_days or day_number in session.prefetched_days:
+            return
+        session.prefetched_days[day_number] = asyncio.create_task(self._generate_day(session, day_number))
+    
     async def _plan_day(self, session: PlanningSession, day_number: int) -> AgentResponse:
         """Plan a specific day."""
         try:
-            # Calculate date for this day
-            start_date = datetime.fromisoformat(session.context["start_date"]).date()
-            day_date = start_date + timedelta(days=day_number - 1)
-            
-            # Generate itinerary with Itinerary agent
-            itinerary_message = AgentMessage(
-                agent_id="orchestrator",
-                message_type="generate_itinerary",
-                content={
-                    "user_profile": session.user_profile.dict(),
-                    "destination": session.context["destination"],
-                    "date": day_date.isoformat(),
-                    "day_index": day_number
-                }
-            )
-            
-            itinerary_response = await self.itinerary.process_message(itinerary_message)
-            
-            if not itinerary_response.success:
-                return self._create_error_response(f"Itinerary generation failed: {itinerary_response.error}")
-            
-            # Critique the itinerary
-            critique_message = AgentMessage(
-                agent_id="orchestrator",
-                message_type="critique_itinerary",
-                content={
-                    "itinerary": itinerary_response.data["itinerary"],
-                    "user_profile": session.user_profile.dict()
-                }
+            # Bound the whole generate/critique/revise cycle; expiry cancels in-flight sub-agent calls
+            async with asyncio.timeout(self.workflow_config.max_planning_time_minutes * 60):
+                # Use the itinerary generated ahead of time for this day if there is one
+                prefetched = session.prefetched_days.pop(day_number, None)
+                if prefetched is not None:
+                    itinerary_response = await prefetched
+                else:
+                    itinerary_response = await self._generate_day(session, day_number)
+                
+                if not itinerary_response.success:
+                    return self._create_error_response(f"Itinerary generation failed: {itinerary_response.error}")
+                
+                # Generate the next day while this one is critiqued and confirmed
+                self._prefetch_day(session, day_number + 1)
+                
+                # Skip the critique round-trip when the planner is already confident in the plan
+                itinerary = itinerary_response.data["itinerary"]
+                self_confidence = itinerary_response.data.get("self_confidence", 0)
+                if self_confidence >= self.workflow_config.auto_approve_threshold:
+                    self.logger.info("Auto-approved day %s of trip %s (self_confidence=%s)",
+                                     day_number, session.trip_id, self_confidence)
+                    return self._present_day(session, day_number, itinerary, {
+                        "approved": True,
+                        "score": self_confidence,
+                        "issues": []
+                    })
+                
+                self.logger.info("Sending day %s of trip %s to critique (self_confidence=%s)",
+                                 day_number, session.trip_id, self_confidence)
+                
+                # Critique and revise until approved
+                return await self._review_day(session, day_number, itinerary)
+        
+        except TimeoutError:
+            self.logger.error("Planning day %s of trip %s exceeded the planning time limit", day_number, session.trip_id)
+            session.state = PlanningState.ERROR
+            session.cancel_prefetch()
+            session.updated_at = _utcnow()
+            
+            # Return what has been planned so far along with the error
+            return AgentResponse(
+                success=False,
+                error=f"Planning day {day_number} exceeded {self.workflow_config.max_planning_time_minutes} minutes",
+                data={
+                    "trip_id": session.trip_id,
+                    "day_number": day_number,
+                    "state": "error",
+                    "confirmed_days": day_number - 1,
+                    "itinerary": session.current_itinerary
+                },
+                agent_id=self.agent_id
             )
-            
-            critique_response = await self.critique.process_message(critique_message)
+        
+        except Exception as e:
+            self.logger.error("Error planning day %s: %s", day_number, e)
+            return self._create_error_response(f"Failed to plan day {day_number}: {str(e)}")
+    
+    async def _critique_day(self, session: PlanningSession, itinerary: Dict[str, Any]) -> AgentResponse:
+        """Critique an itinerary, reusing the result for plans already critiqued in this session."""
+        digest = _itinerary_digest(itinerary)
+        cached_result = session.critique_cache.get(digest)
+        if cached_result is not None:
+            return self._create_success_response({"critique_result": cached_result})
+        
+        critique_message = AgentMessage(
+            agent_id="orchestrator",
+            message_type="critique_itinerary",
+            content={
+                "itinerary": itinerary,
+                "user_profile": session.user_profile
+            }
+        )
+        
+        critique_response = await self._call_agent(session, self.critique, critique_message)
+        if critique_response.success:
+            session.critique_cache[digest] = critique_response.data["critique_result"]
+        
+        return critique_response
+    
+    async def _review_day(self, session: PlanningSession, day_number: int, itinerary: Dict[str, Any]) -> AgentResponse:
+        """Critique a day's itinerary, revising it in place until approved or out of revision cycles."""
+        max_revision_cycles = self.workflow_config.max_revision_cycles
+        
+        for revision_cycle in range(max_revision_cycles + 1):
+            critique_response = await self._critique_day(session, itinerary)
             
             if not critique_response.success:
                 return self._create_error_response(f"Critique failed: {critique_response.error}")
@@ -345,78 +811,61 @@ class OrchestratorAgent(BaseAgent):
             critique_result = critique_response.data["critique_result"]
             
             # Check if approved
-            if critique_result["approved"]:
-                # Present to user for confirmation
-                session.state = PlanningState.CONFIRMING
-                session.updated_at = datetime.utcnow()
-                
-                return self._create_success_response({
-                    "trip_id": session.trip_id,
-                    "day_number": day_number,
-                    "state": "confirming",
-                    "itinerary": itinerary_response.data["itinerary"],
-                    "critique_score": critique_result["score"],
-                    "day_progress": {
-                        "current": day_number,
-                        "total": session.total_days
-                    }
-                })
-            else:
-                # Needs revision
-                return await self._revise_itinerary(session, day_number, itinerary_response.data, critique_result)
-                
-        except Exception as e:
-            self.logger.error(f"Error planning day {day_number}: {str(e)}")
-            return self._create_error_response(f"Failed to plan day {day_number}: {str(e)}")
-    
-    async def _revise_itinerary(self, session: PlanningSession, day_number: int, itinerary_data: Dict[str, Any], critique_result: Dict[str, Any]) -> AgentResponse:
-        """Revise an itinerary based on critique."""
-        try:
-            # Check revision cycle limit
-            revision_count = session.context.get("revision_count", 0)
-            if revision_count >= self.workflow_config["max_revision_cycles"]:
-                # Too many revisions, present current version
-                return self._create_success_response({
-                    "trip_id": session.trip_id,
-                    "day_number": day_number,
-                    "state": "confirming",
-                    "itinerary": itinerary_data["itinerary"],
-                    "critique_score": critique_result["score"],
-                    "warning": "Maximum revisions reached, presenting current version",
-                    "issues": critique_result["issues"]
-                })
-            
-            # Generate revision feedback
-            revision_feedback = self._generate_revision_feedback(critique_result)
+            if critique_result["approved"] or revision_cycle == max_revision_cycles:
+                break
             
-            # Revise with Itinerary agent
-            revision_message = AgentMessage(
-                agent_id="orchestrator",
-                message_type="revise_itinerary",
-                content={
-                    "user_profile": session.user_profile.dict(),
-                    "destination": session.context["destination"],
-                    "date": datetime.fromisoformat(session.context["start_date"]).date() + timedelta(days=day_number - 1),
-                    "day_index": day_number,
-                    "existing_itinerary": itinerary_data["itinerary"],
-                    "revision_feedback": revision_feedback
-                }
+            # Needs revision: revise the current plan rather than generating a new one
+            revision_response = await self._revise_day(
+                session, day_number, itinerary, self._generate_revision_feedback(critique_result)
             )
             
-            revision_response = await self.itinerary.process_message(revision_message)
-            
-            if revision_response.success:
-                # Update revision count
-                session.context["revision_count"] = revision_count + 1
-                
-                # Re-critique the revised itinerary
-                return await self._plan_day(session, day_number)
-            else:
+            if not revision_response.success:
                 return self._create_error_response(f"Revision failed: {revision_response.error}")
-                
-        except Exception as e:
-            self.logger.error(f"Error revising itinerary: {str(e)}")
-            return self._create_error_response(f"Failed to revise itinerary: {str(e)}")
+            
+            itinerary = revision_response.data["revised_itinerary"]
+        
+        return self._present_day(session, day_number, itinerary, critique_result)
+    
+    def _present_day(self, session: PlanningSession, day_number: int, itinerary: Dict[str, Any], critique_result: Dict[str, Any]) -> AgentResponse:
+        """Present a day's itinerary to the user for confirmation."""
+        session.state = PlanningState.CONFIRMING
+        session.current_itinerary = itinerary
+        session.updated_at = _utcnow()
+        
+        response_data = {
+            "trip_id": session.trip_id,
+            "day_number": day_number,
+            "state": "confirming",
+            "itinerary": itinerary,
+            "critique_score": critique_result["score"],
+            "day_progress": {
+                "current": day_number,
+                "total": session.total_days
+            }
+        }
+        if not critique_result["approved"]:
+            # Too many revisions, present current version
+            response_data["warning"] = "Maximum revisions reached, presenting current version"
+            response_data["issues"] = critique_result["issues"]
+        
+        return self._create_success_response(response_data)
+    
+    async def _revise_day(self, session: PlanningSession, day_number: int, itinerary: Dict[str, Any], revision_feedback: str) -> AgentResponse:
+        """Revise a day's itinerary with the Itinerary agent."""
+        revision_message = AgentMessage(
+            agent_id="orchestrator",
+            message_type="revise_itinerary",
+            content={
+                "user_profile": session.user_profile,
+                "destination": session.context["destination"],
+                "date": session.day_date_iso(day_number),
+                "day_index": day_number,
+                "existing_itinerary": itinerary,
+                "revision_feedback": revision_feedback
+            }
+        )
+        
+        return await self._call_agent(session, self.itinerary, revision_message)
     
     async def _confirm_day(self, content: Dict[str, Any]) -> AgentResponse:
         """Confirm a day's itinerary."""
@@ -425,17 +874,17 @@ class OrchestratorAgent(BaseAgent):
             day_number = content.get("day_number")
             confirmed = content.get("confirmed", False)
             
-            if not trip_id or trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 return self._create_error_response("Invalid trip_id")
             
-            session = self.planning_sessions[trip_id]
-            
             if not confirmed:
                 return self._create_error_response("Day not confirmed")
             
             # Mark day as confirmed
-            session.current_day = day_number
-            session.updated_at = datetime.utcnow()
+            session.set_current_day(day_number)
+            session.current_itinerary = None
+            session.updated_at = _utcnow()
             
             # Check if all days are planned
             if day_number >= session.total_days:
@@ -443,7 +892,7 @@ class OrchestratorAgent(BaseAgent):
                 session.state = PlanningState.COMPLETED
                 
                 # Start monitoring if enabled
-                if self.workflow_config["enable_auto_monitoring"]:
+                if self.workflow_config.enable_auto_monitoring:
                     await self._start_trip_monitoring({"trip_id": trip_id})
                 
                 return self._create_success_response({
@@ -451,7 +900,7 @@ class OrchestratorAgent(BaseAgent):
                     "planning_complete": True,
                     "state": "completed",
                     "total_days": session.total_days,
-                    "monitoring_started": self.workflow_config["enable_auto_monitoring"]
+                    "monitoring_started": self.workflow_config.enable_auto_monitoring
                 })
             else:
                 # Plan next day
@@ -459,7 +908,7 @@ class OrchestratorAgent(BaseAgent):
                 return await self._plan_day(session, next_day)
                 
         except Exception as e:
-            self.logger.error(f"Error confirming day: {str(e)}")
+            self.logger.error("Error confirming day: %s", e)
             return self._create_error_response(f"Failed to confirm day: {str(e)}")
     
     async def _request_revision(self, content: Dict[str, Any]) -> AgentResponse:
@@ -472,66 +921,55 @@ class OrchestratorAgent(BaseAgent):
             if not all([trip_id, day_number, feedback]):
                 return self._create_error_response("trip_id, day_number, and feedback are required")
             
-            if trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 return self._create_error_response("Invalid trip_id")
             
-            session = self.planning_sessions[trip_id]
-            
             # Store user feedback
             session.context["user_feedback"] = feedback
-            session.updated_at = datetime.utcnow()
+            session.updated_at = _utcnow()
             
-            # Calculate date for this day
-            start_date = datetime.fromisoformat(session.context["start_date"]).date()
-            day_date = start_date + timedelta(days=day_number - 1)
+            if session.current_itinerary is None:
+                # Nothing presented yet to revise, plan the day from scratch
+                return await self._plan_day(session, day_number)
             
             # Revise with user feedback
-            revision_message = AgentMessage(
-                agent_id="orchestrator",
-                message_type="revise_itinerary",
-                content={
-                    "user_profile": session.user_profile.dict(),
-                    "destination": session.context["destination"],
-                    "date": day_date.isoformat(),
-                    "day_index": day_number,
-                    "revision_feedback": feedback
-                }
-            )
-            
-            revision_response = await self.itinerary.process_message(revision_message)
+            revision_response = await self._revise_day(session, day_number, session.current_itinerary, feedback)
             
             if revision_response.success:
                 # Re-critique the revised itinerary
-                return await self._plan_day(session, day_number)
+                return await self._review_day(session, day_number, revision_response.data["revised_itinerary"])
             else:
                 return self._create_error_response(f"Revision failed: {revision_response.error}")
                 
         except Exception as e:
-            self.logger.error(f"Error requesting revision: {str(e)}")
+            self.logger.error("Error requesting revision: %s", e)
             return self._create_error_response(f"Failed to request revision: {str(e)}")
     
     async def _start_trip_monitoring(self, content: Dict[str, Any]) -> AgentResponse:
         """Start monitoring a trip."""
         try:
             trip_id = content.get("trip_id")
-            if not trip_id or trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 return self._create_error_response("Invalid trip_id")
             
-            session = self.planning_sessions[trip_id]
-            
-            # Get trip data
-            trip_data = session.trip_data
-            if not trip_data:
-                # Create trip data from session
-                trip_data = Trip(
-                    trip_id=trip_id,
-                    user_id=session.user_id,
-                    destination=session.context["destination"],
-                    start_date=datetime.fromisoformat(session.context["start_date"]).date(),
-                    end_date=datetime.fromisoformat(session.context["end_date"]).date(),
-                    duration_days=session.context["duration_days"],
-                    status=TripStatus.CONFIRMED
-                )
+            # Get trip data, serialized once and kept on the session
+            if session.trip_payload is None:
+                trip_data = session.trip_data
+                if not trip_data:
+                    # Create trip data from session
+                    trip_data = Trip(
+                        trip_id=trip_id,
+                        user_id=session.user_id,
+                        destination=session.context["destination"],
+                        start_date=session.start_date,
+                        end_date=session.end_date,
+                        duration_days=session.context["duration_days"],
+                        status=TripStatus.CONFIRMED
+                    )
+                session.trip_data = trip_data
+                session.trip_payload = trip_data.model_dump()
             
             # Start monitoring
             monitor_message = AgentMessage(
@@ -540,15 +978,21 @@ class OrchestratorAgent(BaseAgent):
                 content={
                     "trip_id": trip_id,
                     "user_id": session.user_id,
-                    "trip_data": trip_data.dict()
+                    "trip_data": session.trip_payload
                 }
             )
             
-            monitor_response = await self.monitor.process_message(monitor_message)
+            monitor_response = await self._call_agent(session, self.monitor, monitor_message)
             
             if monitor_response.success:
                 session.state = PlanningState.MONITORING
-                session.updated_at = datetime.utcnow()
+                session.updated_at = _utcnow()
+                
+                # Trips under monitoring outlive the confirmation timeout
+                self.session_store.set(session, ttl_seconds=None)
+                
+                if self._disruption_consumer is None or self._disruption_consumer.done():
+                    self._disruption_consumer = asyncio.create_task(self._consume_disruptions())
                 
                 return self._create_success_response({
                     "trip_id": trip_id,
@@ -560,7 +1004,7 @@ class OrchestratorAgent(BaseAgent):
                 return self._create_error_response(f"Monitoring failed: {monitor_response.error}")
                 
         except Exception as e:
-            self.logger.error(f"Error starting trip monitoring: {str(e)}")
+            self.logger.error("Error starting trip monitoring: %s", e)
             return self._create_error_response(f"Failed to start trip monitoring: {str(e)}")
     
     async def _handle_disruption(self, content: Dict[str, Any]) -> AgentResponse:
@@ -572,18 +1016,17 @@ class OrchestratorAgent(BaseAgent):
             if not all([trip_id, disruption_data]):
                 return self._create_error_response("trip_id and disruption are required")
             
-            if trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 return self._create_error_response("Invalid trip_id")
-            
-            session = self.planning_sessions[trip_id]
             session.state = PlanningState.REPLANNING
-            session.updated_at = datetime.utcnow()
-            
-            # Analyze disruption impact
-            disruption_impact = await self._analyze_disruption_impact(session, disruption_data)
+            session.updated_at = _utcnow()
             
-            # Generate replanning options
-            replanning_options = await self._generate_replanning_options(session, disruption_data, disruption_impact)
+            # Analyze disruption impact and generate replanning options concurrently
+            disruption_impact, replanning_options = await asyncio.gather(
+                self._analyze_disruption_impact(session, disruption_data),
+                self._generate_replanning_options(session, disruption_data)
+            )
             
             return self._create_success_response({
                 "trip_id": trip_id,
@@ -594,42 +1037,48 @@ class OrchestratorAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error handling disruption: {str(e)}")
+            self.logger.error("Error handling disruption: %s", e)
             return self._create_error_response(f"Failed to handle disruption: {str(e)}")
     
+    async def _consume_disruptions(self):
+        """Handle disruptions from the monitor's alert queue as they are detected."""
+        while True:
+            alert = await self._disruption_queue.get()
+            try:
+                response = await self.process_message(AgentMessage(
+                    agent_id="monitor",
+                    message_type="handle_disruption",
+                    content=alert
+                ))
+                if not response.success:
+                    self.logger.warning("Disruption for trip %s not handled: %s", alert.get("trip_id"), response.error)
+            except Exception as e:
+                self.logger.error("Error consuming disruption: %s", e)
+            finally:
+                self._disruption_queue.task_done()
+    
     async def _get_planning_status(self, content: Dict[str, Any]) -> AgentResponse:
         """Get current planning status."""
         try:
             trip_id = content.get("trip_id")
-            if not trip_id or trip_id not in self.planning_sessions:
+            session = self.session_store.get(trip_id)
+            if not session:
                 return self._create_error_response("Invalid trip_id")
             
-            session = self.planning_sessions[trip_id]
-            
-            return self._create_success_response({
-                "trip_id": trip_id,
-                "state": session.state.value,
-                "current_day": session.current_day,
-                "total_days": session.total_days,
-                "progress": session.current_day / session.total_days * 100,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "context": session.context
-            })
+            # The session keeps the fixed part of the payload; each poll gets its own response
+            return self._create_success_response(session.planning_status())
             
         except Exception as e:
-            self.logger.error(f"Error getting planning status: {str(e)}")
+            self.logger.error("Error getting planning status: %s", e)
             return self._create_error_response(f"Failed to get planning status: {str(e)}")
     
     async def _cancel_planning(self, content: Dict[str, Any]) -> AgentResponse:
         """Cancel trip planning."""
         try:
             trip_id = content.get("trip_id")
-            if not trip_id or trip_id not in self.planning_sessions:
-                return self._create_error_response("Invalid trip_id")
-            
             # Remove session
-            del self.planning_sessions[trip_id]
+            if not self.session_store.delete(trip_id):
+                return self._create_error_response("Invalid trip_id")
             
             return self._create_success_response({
                 "trip_id": trip_id,
@@ -637,52 +1086,29 @@ class OrchestratorAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error cancelling planning: {str(e)}")
+            self.logger.error("Error cancelling planning: %s", e)
             return self._create_error_response(f"Failed to cancel planning: {str(e)}")
     
     def _generate_revision_feedback(self, critique_result: Dict[str, Any]) -> str:
         """Generate feedback for revision based on critique."""
-        issues = critique_result.get("issues", [])
-        
-        feedback_parts = []
-        for issue in issues:
-            if issue.get("severity") == "high":
-                feedback_parts.append(f"Critical: {issue.get('description', 'Unknown issue')}")
-            elif issue.get("severity") == "medium":
-                feedback_parts.append(f"Issue: {issue.get('description', 'Unknown issue')}")
-        
-        return "; ".join(feedback_parts) if feedback_parts else "Please improve the itinerary quality"
+        return _revision_feedback(tuple(
+            (issue.get("severity"), issue.get("description", "Unknown issue"))
+            for issue in critique_result.get("issues", ())
+        ))
     
     async def _analyze_disruption_impact(self, session: PlanningSession, disruption_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the impact of a disruption."""
-        # Simplified disruption impact analysis
         return {
             "severity": disruption_data.get("severity", "medium"),
             "affected_activities": disruption_data.get("affected_activities", []),
             "requires_replanning": True,
-            "impact_score": 0.7  # Simplified scoring
+            "impact_score": _disruption_impact_score(disruption_data)
         }
     
-    async def _generate_replanning_options(self, session: PlanningSession, disruption_data: Dict[str, Any], impact: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _generate_replanning_options(self, session: PlanningSession, disruption_data: Dict[str, Any]) -> Tuple[Dict[str, Any], ...]:
         """Generate replanning options for a disruption."""
         # Simplified replanning options
-        return [
-            {
-                "option": "reschedule_activities",
-                "description": "Reschedule affected activities to later times",
-                "estimated_impact": "low"
-            },
-            {
-                "option": "replace_activities",
-                "description": "Replace affected activities with alternatives",
-                "estimated_impact": "medium"
-            },
-            {
-                "option": "cancel_activities",
-                "description": "Cancel affected activities and extend others",
-                "estimated_impact": "high"
-            }
-        ]
+        return _REPLANNING_OPTIONS
     
     # Chat-related handlers
     
@@ -694,11 +1120,7 @@ class OrchestratorAgent(BaseAgent):
                 return self._create_error_response("user_id is required")
             
             # Find active session for user
-            active_session = None
-            for session in self.planning_sessions.values():
-                if session.user_id == user_id:
-                    active_session = session
-                    break
+            active_session = self.session_store.first_for_user(user_id)
             
             if not active_session:
                 return self._create_success_response({
@@ -706,20 +1128,11 @@ class OrchestratorAgent(BaseAgent):
                     "message": "No active planning session found"
                 })
             
-            return self._create_success_response({
-                "status": "active",
-                "trip_id": active_session.trip_id,
-                "state": active_session.state.value,
-                "current_day": active_session.current_day,
-                "total_days": active_session.total_days,
-                "progress": active_session.current_day / active_session.total_days * 100 if active_session.total_days > 0 else 0,
-                "created_at": active_session.created_at.isoformat(),
-                "updated_at": active_session.updated_at.isoformat(),
-                "destination": active_session.context.get("destination") if active_session.context else None
-            })
+            # The session memoizes the payload until it changes; copy it so responses don't share it
+            return self._create_success_response(dict(active_session.status_view()))
             
         except Exception as e:
-            self.logger.error(f"Error getting session status: {str(e)}")
+            self.logger.error("Error getting session status: %s", e)
             return self._create_error_response(f"Failed to get session status: {str(e)}")
     
     async def _reset_session(self, content: Dict[str, Any]) -> AgentResponse:
@@ -730,13 +1143,7 @@ class OrchestratorAgent(BaseAgent):
                 return self._create_error_response("user_id is required")
             
             # Find and remove active session for user
-            sessions_to_remove = []
-            for trip_id, session in self.planning_sessions.items():
-                if session.user_id == user_id:
-                    sessions_to_remove.append(trip_id)
-            
-            for trip_id in sessions_to_remove:
-                del self.planning_sessions[trip_id]
+            sessions_to_remove = self.session_store.delete_user(user_id)
             
             return self._create_success_response({
                 "message": "Session reset successfully",
@@ -744,7 +1151,7 @@ class OrchestratorAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error resetting session: {str(e)}")
+            self.logger.error("Error resetting session: %s", e)
             return self._create_error_response(f"Failed to reset session: {str(e)}")
     
     async def _get_chat_history(self, content: Dict[str, Any]) -> AgentResponse:
@@ -754,28 +1161,79 @@ class OrchestratorAgent(BaseAgent):
             if not user_id:
                 return self._create_error_response("user_id is required")
             
+            # Page backwards from the cursor (a message id), newest page first
+            cursor = content.get("cursor")
+            size = min(int(content.get("size", 50)), 200)
+            
             # Get conversation history from orchestrator agent
-            history = self.get_conversation_history()
+            page_start, history, has_more = self.get_history_page(
+                size, before=int(cursor) if cursor is not None else None
+            )
             
             # Filter for user-specific messages (simplified)
             user_history = [
                 {
+                    "id": page_start + offset,
                     "timestamp": msg.timestamp.isoformat(),
                     "message_type": msg.message_type,
                     "content": msg.content
                 }
-                for msg in history[-50:]  # Last 50 messages
+                for offset, msg in enumerate(history)
             ]
             
             return self._create_success_response({
                 "history": user_history,
-                "count": len(user_history)
+                "count": len(user_history),
+                "next_cursor": page_start if has_more else None,
+                "has_more": has_more
             })
             
         except Exception as e:
-            self.logger.error(f"Error getting chat history: {str(e)}")
+            self.logger.error("Error getting chat history: %s", e)
             return self._create_error_response(f"Failed to get chat history: {str(e)}")
     
+    async def stream_chat_history(
+        self, user_id: str, trip_id: Optional[str] = None, size: int = 50, cursor: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a page of a user's chat history, optionally for one trip, as NDJSON, one encoded message per line.
+        
+        Includes the user's requests and the orchestrator's replies to them. With trip_id,
+        messages not tied to a trip (such as extract_trip_info) are left out.
+        """
+        # Only message references are copied; the history deque can change between yields
+        page = self._user_history_page(user_id, trip_id, min(size, 200), before=cursor)
+        
+        for message_id, msg in page:
+            yield orjson.dumps({
+                "id": message_id,
+                "timestamp": msg.timestamp,
+                "message_type": msg.message_type,
+                "content": msg.content
+            }, default=str) + b"\n"
+    
+    def _user_history_page(
+        self, user_id: str, trip_id: Optional[str], size: int, before: Optional[int] = None
+    ) -> List[Tuple[int, AgentMessage]]:
+        """Get up to size (message id, message) pairs for a user older than the `before` id, in chronological order."""
+        history = self.conversation_history
+        length = len(history)
+        first_id = self._history_seq - length
+        end = length if before is None else max(0, min(before - first_id, length))
+        
+        # Walk back from the cursor so a page holds size matching messages, not size messages filtered down
+        page = []
+        for index, msg in zip(range(end - 1, -1, -1), islice(reversed(history), length - end, None)):
+            if msg.content.get("user_id") != user_id:
+                continue
+            if trip_id is not None and msg.content.get("trip_id") != trip_id:
+                continue
+            page.append((first_id + index, msg))
+            if len(page) == size:
+                break
+        
+        page.reverse()
+        return page
+    
     async def _extract_trip_info(self, content: Dict[str, Any]) -> AgentResponse:
         """Extract trip information from user message."""
         try:
@@ -800,18 +1258,70 @@ class OrchestratorAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error extracting trip info: {str(e)}")
+            self.logger.error("Error extracting trip info: %s", e)
             return self._create_error_response(f"Failed to extract trip info: {str(e)}")
     
     # Helper methods for chat functionality
     
+    def _today(self) -> date:
+        """Get today's date, re-reading the clock at most once a minute."""
+        checked_at, today = self._today_cache
+        now = time.monotonic()
+        if today is None or now - checked_at > 60:
+            today = date.today()
+            self._today_cache = (now, today)
+        return today
+    
+    def _parse_trip_fast_path(self, message: str) -> Optional[Dict[str, Any]]:
+        """Parse simple trip requests with regular expressions, without calling the LLM."""
+        matched = _match_trip_pattern(" ".join(message.split()))
+        if matched is None:
+            return None
+        
+        destination, duration_days, start_month, start_day, end_month, end_day = matched
+        today = self._today()
+        
+        try:
+            if duration_days:
+                # Same defaults the LLM prompt asks for when no dates are given
+                start_date = today + timedelta(days=30)
+            else:
+                start_date = date(today.year, start_month, start_day)
+                if start_date < today:
+                    start_date = start_date.replace(year=today.year + 1)
+                end_date = date(start_date.year, end_month, end_day)
+                if end_date < start_date:
+                    end_date = end_date.replace(year=start_date.year + 1)
+                duration_days = (end_date - start_date).days + 1
+        except ValueError:
+            return None
+        
+        if duration_days > 30:
+            return None
+        
+        return {
+            "destination": destination,
+            "start_date": start_date,
+            "end_date": start_date + timedelta(days=duration_days - 1),
+            "duration_days": duration_days,
+            "food_preferences": [],
+            "activities": [],
+            "travelers": 1,
+            "budget_level": "mid-range"
+        }
+    
     async def _parse_trip_from_message(self, message: str) -> Optional[Dict[str, Any]]:
         """Parse trip information from user message using AI."""
         try:
+            # Plain requests like "5-day trip to Tokyo" don't need an LLM round-trip
+            trip_info = self._parse_trip_fast_path(message)
+            if trip_info is not None:
+                return trip_info
+            
             # Get current date and time information
-            from datetime import datetime, timedelta
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            current_day_of_week = datetime.now().strftime("%A")
+            today = self._today()
+            current_date = today.isoformat()
+            current_day_of_week = today.strftime("%A")
             current_time = datetime.now().strftime("%H:%M:%S")
             
             # Use AI to extract trip information from the message
@@ -888,13 +1398,12 @@ class OrchestratorAgent(BaseAgent):
             
             # Validate the result
             if not extraction_result or not extraction_result.get("destination"):
-                self.logger.info(f"No valid trip information found in message: {message}")
+                self.logger.info("No valid trip information found in message: %s", message)
                 return None
             
             # Convert date strings to date objects for consistency
-            from datetime import datetime
-            start_date = datetime.strptime(extraction_result["start_date"], "%Y-%m-%d").date()
-            end_date = datetime.strptime(extraction_result["end_date"], "%Y-%m-%d").date()
+            start_date = date.fromisoformat(extraction_result["start_date"])
+            end_date = date.fromisoformat(extraction_result["end_date"])
             
             return {
                 "destination": extraction_result["destination"],
@@ -908,17 +1417,16 @@ class OrchestratorAgent(BaseAgent):
             }
             
         except Exception as e:
-            self.logger.error(f"Error parsing trip from message with AI: {str(e)}")
+            self.logger.error("Error parsing trip from message with AI: %s", e)
             return None
     
     async def _handle_confirmation(self, session: PlanningSession, content: Dict[str, Any]) -> AgentResponse:
         """Handle user confirmation in CONFIRMING state."""
         try:
-            user_message = content.get("user_message", "").lower()
+            user_message = content.get("user_message", "")
             
             # Check if user is confirming
-            confirm_keywords = ["yes", "okay", "sure", "confirm", "approve", "good", "perfect", "looks good"]
-            if any(keyword in user_message for keyword in confirm_keywords):
+            if _CONFIRM_RE.search(user_message):
                 # Confirm the current day
                 return await self._confirm_day({
                     "trip_id": session.trip_id,
@@ -934,7 +1442,7 @@ class OrchestratorAgent(BaseAgent):
                 })
                 
         except Exception as e:
-            self.logger.error(f"Error handling confirmation: {str(e)}")
+            self.logger.error("Error handling confirmation: %s", e)
             return self._create_error_response(f"Failed to handle confirmation: {str(e)}")
     
     async def _continue_daily_planning(self, session: PlanningSession, content: Dict[str, Any]) -> AgentResponse:
@@ -950,5 +1458,5 @@ class OrchestratorAgent(BaseAgent):
             })
             
         except Exception as e:
-            self.logger.error(f"Error continuing daily planning: {str(e)}")
+            self.logger.error("Error continuing daily planning: %s", e)
             return self._create_error_response(f"Failed to continue daily planning: {str(e)}") 
\ No newline at end of file
@@ -1,11 +1,49 @@
 import asyncio
+import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from pydantic import BaseModel
+
 from src.agents.base_agent import BaseAgent, AgentMessage, AgentResponse
 from src.models.user import UserProfile, UserPreferences, TravelerInfo, Budget, TravelStyle, TravelPace, BudgetLevel, TravelerType
 
 
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Common words dropped from keyword extraction
+_STOPWORDS = frozenset({"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "is", "are", "was", "were", "i", "me", "my", "you", "your"})
+
+_POSITIVE_WORDS = frozenset({"love", "enjoy", "great", "amazing", "wonderful", "fantastic", "excited", "passion", "favorite"})
+_NEGATIVE_WORDS = frozenset({"hate", "dislike", "terrible", "awful", "boring", "stressful", "avoid"})
+
+# Keywords looked for in onboarding answers. Every matching travel style applies;
+# for the others the first match wins, so order matters
+_TRAVEL_STYLE_KEYWORDS = {
+    "adventure": TravelStyle.ADVENTURE,
+    "cultural": TravelStyle.CULTURAL,
+    "relaxation": TravelStyle.RELAXATION,
+    "business": TravelStyle.BUSINESS,
+    "luxury": TravelStyle.LUXURY,
+    "budget": TravelStyle.BUDGET
+}
+_PACE_KEYWORDS = (
+    ("slow", TravelPace.SLOW),
+    ("fast", TravelPace.FAST)
+)
+_BUDGET_KEYWORDS = (
+    ("budget", BudgetLevel.BUDGET),
+    ("luxury", BudgetLevel.LUXURY)
+)
+# keyword -> (traveler type, default group size)
+_GROUP_KEYWORDS = (
+    ("couple", (TravelerType.COUPLE, 2)),
+    ("family", (TravelerType.FAMILY, 4)),
+    ("friends", (TravelerType.FRIENDS, 3)),
+    ("business", (TravelerType.BUSINESS, 1))
+)
+
+
 class ProfilerAgent(BaseAgent):
     """Agent responsible for user onboarding and profile building through conversational interactions."""
     
@@ -70,6 +108,14 @@ class ProfilerAgent(BaseAgent):
                 "optional": True
             }
         ]
+        
+        # The questions never change, so lowercase the options once for response matching
+        for question in self.onboarding_questions:
+            if "options" in question:
+                question["_options_lower"] = [option.lower() for option in question["options"]]
+        
+        # Client-facing form of each question, shared by every response; treat as read-only
+        self._formatted_questions = [self._format_question(question) for question in self.onboarding_questions]
     
     def get_prompt_template(self) -> str:
         """Get the agent's prompt template."""
@@ -110,17 +156,16 @@ class ProfilerAgent(BaseAgent):
             return self._create_error_response("user_id is required")
         
         # Initialize onboarding state
-        self.set_memory("user_id", user_id, scope="session")
-        self.set_memory("current_question_index", 0, scope="session")
-        self.set_memory("responses", {}, scope="session")
-        self.set_memory("onboarding_complete", False, scope="session")
-        
-        # Get first question
-        first_question = self.onboarding_questions[0]
+        self.set_memory_bulk({
+            "user_id": user_id,
+            "current_question_index": 0,
+            "responses": {},
+            "onboarding_complete": False
+        }, scope="session")
         
         return self._create_success_response({
             "onboarding_started": True,
-            "question": self._format_question(first_question),
+            "question": self._formatted_questions[0],
             "progress": {
                 "current": 1,
                 "total": len(self.onboarding_questions)
@@ -139,28 +184,25 @@ class ProfilerAgent(BaseAgent):
         if current_index >= len(self.onboarding_questions):
             return self._create_error_response("Onboarding already complete")
         
-        # Store current response
+        # Store current response and move to next question
         current_question = self.onboarding_questions[current_index]
         responses[current_question["id"]] = user_response
-        self.set_memory("responses", responses, scope="session")
+        next_index = current_index + 1
+        self.set_memory_bulk({
+            "responses": responses,
+            "current_question_index": next_index
+        }, scope="session")
         
         # Process and validate response
         processed_response = await self._process_response(current_question, user_response)
         
-        # Move to next question
-        next_index = current_index + 1
-        self.set_memory("current_question_index", next_index, scope="session")
-        
         # Check if onboarding is complete
         if next_index >= len(self.onboarding_questions):
             return await self._complete_onboarding()
         
-        # Get next question
-        next_question = self.onboarding_questions[next_index]
-        
         return self._create_success_response({
             "response_processed": True,
-            "next_question": self._format_question(next_question),
+            "next_question": self._formatted_questions[next_index],
             "progress": {
                 "current": next_index + 1,
                 "total": len(self.onboarding_questions)
@@ -176,8 +218,8 @@ class ProfilerAgent(BaseAgent):
         # Generate user profile from responses
         profile = await self._generate_profile_from_responses(user_id, responses)
         
-        # Store in user memory
-        self.set_memory("user_profile", profile.dict(), scope="user")
+        # Store in user memory; kept as a model so finalizing doesn't re-validate it
+        self.set_memory("user_profile", profile, scope="user")
         self.set_memory("onboarding_complete", True, scope="session")
         
         return self._create_success_response({
@@ -192,22 +234,18 @@ class ProfilerAgent(BaseAgent):
         confirmed = content.get("confirmed", False)
         modifications = content.get("modifications", {})
         
-        profile_data = self.get_memory("user_profile", scope="user")
-        if not profile_data:
+        profile = self.get_memory("user_profile", scope="user")
+        if not profile:
             return self._create_error_response("No profile found to finalize")
         
         if not confirmed:
             return self._create_error_response("Profile not confirmed by user")
         
         # Apply any modifications
-        if modifications:
-            profile_data = await self._apply_profile_modifications(profile_data, modifications)
-        
-        # Create final profile
-        final_profile = UserProfile(**profile_data)
+        final_profile = await self._modify_profile(profile, modifications) if modifications else profile
         
         # Store finalized profile
-        self.set_memory("finalized_profile", final_profile.dict(), scope="user")
+        self.set_memory("finalized_profile", final_profile, scope="user")
         
         return self._create_success_response({
             "profile_finalized": True,
@@ -229,11 +267,10 @@ class ProfilerAgent(BaseAgent):
             return self._create_error_response("No existing profile found")
         
         # Apply updates
-        updated_profile_data = await self._apply_profile_modifications(existing_profile, updates)
-        updated_profile = UserProfile(**updated_profile_data)
+        updated_profile = await self._modify_profile(existing_profile, updates)
         
         # Store updated profile
-        self.set_memory("finalized_profile", updated_profile.dict(), scope="user")
+        self.set_memory("finalized_profile", updated_profile, scope="user")
         
         return self._create_success_response({
             "profile_updated": True,
@@ -270,8 +307,7 @@ class ProfilerAgent(BaseAgent):
         # Process based on question type
         if question_type == "multiple_choice" and "options" in question:
             # Try to match response to options
-            options = question["options"]
-            matched_option = self._match_response_to_options(response, options)
+            matched_option = self._match_response_to_options(response, question)
             if matched_option:
                 processed["processed_value"] = matched_option
                 processed["confidence"] = "high"
@@ -281,7 +317,7 @@ class ProfilerAgent(BaseAgent):
         
         elif question_type == "scale":
             # Extract scale value
-            scale_value = self._extract_scale_value(response, question.get("options", []))
+            scale_value = self._extract_scale_value(response, question)
             processed["processed_value"] = scale_value
         
         elif question_type == "open_ended":
@@ -296,28 +332,14 @@ class ProfilerAgent(BaseAgent):
         # Extract travel style
         travel_style = []
         if "travel_style" in responses:
-            style_response = responses["travel_style"]
-            if "adventure" in style_response.lower():
-                travel_style.append(TravelStyle.ADVENTURE)
-            if "cultural" in style_response.lower():
-                travel_style.append(TravelStyle.CULTURAL)
-            if "relaxation" in style_response.lower():
-                travel_style.append(TravelStyle.RELAXATION)
-            if "business" in style_response.lower():
-                travel_style.append(TravelStyle.BUSINESS)
-            if "luxury" in style_response.lower():
-                travel_style.append(TravelStyle.LUXURY)
-            if "budget" in style_response.lower():
-                travel_style.append(TravelStyle.BUDGET)
+            style_response = responses["travel_style"].lower()
+            travel_style = [style for keyword, style in _TRAVEL_STYLE_KEYWORDS.items() if keyword in style_response]
         
         # Extract pace preference
         pace = TravelPace.MODERATE
         if "pace_preference" in responses:
             pace_response = responses["pace_preference"].lower()
-            if "slow" in pace_response:
-                pace = TravelPace.SLOW
-            elif "fast" in pace_response:
-                pace = TravelPace.FAST
+            pace = next((value for keyword, value in _PACE_KEYWORDS if keyword in pace_response), pace)
         
         # Extract interests
         interests = []
@@ -328,27 +350,17 @@ class ProfilerAgent(BaseAgent):
         budget_level = BudgetLevel.MID_RANGE
         if "budget" in responses:
             budget_response = responses["budget"].lower()
-            if "budget" in budget_response:
-                budget_level = BudgetLevel.BUDGET
-            elif "luxury" in budget_response:
-                budget_level = BudgetLevel.LUXURY
+            budget_level = next((value for keyword, value in _BUDGET_KEYWORDS if keyword in budget_response), budget_level)
         
         # Extract group info
         travels_with = [TravelerType.SOLO]
         group_size = 1
         if "group_info" in responses:
             group_response = responses["group_info"].lower()
-            if "couple" in group_response:
-                travels_with = [TravelerType.COUPLE]
-                group_size = 2
-            elif "family" in group_response:
-                travels_with = [TravelerType.FAMILY]
-                group_size = 4  # Default family size
-            elif "friends" in group_response:
-                travels_with = [TravelerType.FRIENDS]
-                group_size = 3  # Default friends group size
-            elif "business" in group_response:
-                travels_with = [TravelerType.BUSINESS]
+            group = next((value for keyword, value in _GROUP_KEYWORDS if keyword in group_response), None)
+            if group:
+                travels_with = [group[0]]
+                group_size = group[1]
         
         # Extract dietary restrictions
         dietary_restrictions = []
@@ -415,44 +427,69 @@ class ProfilerAgent(BaseAgent):
         
         return "; ".join(summary_parts)
     
+    async def _modify_profile(self, profile: UserProfile, modifications: Dict[str, Any]) -> UserProfile:
+        """Apply modifications to a profile, re-validating only the sections they touch."""
+        # Fast path: every key is "section.field" on one of the profile's nested models
+        section_updates: Dict[str, Dict[str, Any]] = {}
+        for key, value in modifications.items():
+            section_name, _, field_name = key.partition(".")
+            section = getattr(profile, section_name, None) if field_name else None
+            if not isinstance(section, BaseModel) or field_name not in type(section).model_fields:
+                # Anything else may reshape the profile, so rebuild and validate all of it
+                profile_data = await self._apply_profile_modifications(profile.model_dump(), modifications)
+                return UserProfile(**profile_data)
+            section_updates.setdefault(section_name, {})[field_name] = value
+        
+        # Rebuild each touched section from its current fields so the new values are
+        # validated, then swap the sections in without re-validating the rest
+        updated_sections = {}
+        for section_name, updates in section_updates.items():
+            section = getattr(profile, section_name)
+            updated_sections[section_name] = type(section)(**{**dict(section), **updates})
+        
+        return profile.model_copy(update=updated_sections)
+    
     async def _apply_profile_modifications(self, profile_data: Dict[str, Any], modifications: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply modifications to a profile."""
-        # Deep copy to avoid modifying original
-        import copy
-        modified_profile = copy.deepcopy(profile_data)
+        """Apply modifications to a profile without modifying the original."""
+        # Only the dicts along each modified path are copied; untouched
+        # branches are shared with the original
+        modified_profile = dict(profile_data)
+        copied = {id(modified_profile)}
         
-        # Apply modifications
+        # Apply modifications, including nested keys like "preferences.pace"
         for key, value in modifications.items():
-            if "." in key:
-                # Handle nested keys like "preferences.pace"
-                parts = key.split(".")
-                current = modified_profile
-                for part in parts[:-1]:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                current[parts[-1]] = value
-            else:
-                modified_profile[key] = value
+            parts = key.split(".")
+            current = modified_profile
+            for part in parts[:-1]:
+                child = current.get(part)
+                if child is None:
+                    child = {}
+                elif id(child) not in copied:
+                    child = dict(child)
+                copied.add(id(child))
+                current[part] = child
+                current = child
+            current[parts[-1]] = value
         
         return modified_profile
     
-    def _match_response_to_options(self, response: str, options: List[str]) -> Optional[str]:
-        """Match a response to available options."""
+    def _match_response_to_options(self, response: str, question: Dict[str, Any]) -> Optional[str]:
+        """Match a response to the question's options."""
         response_lower = response.lower()
         
-        for option in options:
-            if option.lower() in response_lower or response_lower in option.lower():
+        for option, option_lower in zip(question["options"], question["_options_lower"]):
+            if option_lower in response_lower or response_lower in option_lower:
                 return option
         
         return None
     
-    def _extract_scale_value(self, response: str, options: List[str]) -> str:
+    def _extract_scale_value(self, response: str, question: Dict[str, Any]) -> str:
         """Extract scale value from response."""
+        options = question.get("options", [])
         response_lower = response.lower()
         
-        for option in options:
-            if option.lower() in response_lower:
+        for option, option_lower in zip(options, question.get("_options_lower", [])):
+            if option_lower in response_lower:
                 return option
         
         # Default to middle option
@@ -460,27 +497,18 @@ class ProfilerAgent(BaseAgent):
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text response."""
-        # Simple keyword extraction
-        import re
-        
-        # Remove common words and punctuation
-        common_words = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "is", "are", "was", "were", "i", "me", "my", "you", "your"}
-        
-        # Extract words
-        words = re.findall(r'\b\w+\b', text.lower())
-        keywords = [word for word in words if word not in common_words and len(word) > 2]
-        
-        # Return unique keywords
-        return list(set(keywords))
+        # Unique words, minus common words and very short ones
+        return list({
+            word for word in _WORD_PATTERN.findall(text.lower())
+            if len(word) > 2 and word not in _STOPWORDS
+        })
     
     def _analyze_sentiment(self, text: str) -> str:
         """Simple sentiment analysis."""
-        positive_words = {"love", "enjoy", "great", "amazing", "wonderful", "fantastic", "excited", "passion", "favorite"}
-        negative_words = {"hate", "dislike", "terrible", "awful", "boring", "stressful", "avoid"}
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        # Whole words only, so "glove" no longer counts as "love"
+        words = set(_WORD_PATTERN.findall(text.lower()))
+        positive_count = len(words & _POSITIVE_WORDS)
+        negative_count = len(words & _NEGATIVE_WORDS)
         
         if positive_count > negative_count:
             return "positive"
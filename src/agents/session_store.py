@@ -0,0 +1,141 @@
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Marks a set() call that should use the store's default TTL
+_DEFAULT_TTL = object()
+
+
+class SessionStore:
+    """In-memory store for planning sessions with sliding expiry and a per-user index.
+    
+    Sessions are keyed by trip_id and must expose `trip_id` and `user_id`. Each
+    read refreshes a session's expiry, like a Redis key whose TTL is reset on access.
+    A session stored with `ttl_seconds=None` never expires.
+    """
+    
+    def __init__(self,
+                 default_ttl_seconds: Optional[float] = None,
+                 on_remove: Optional[Callable[[Any], None]] = None):
+        self.default_ttl_seconds = default_ttl_seconds
+        self._on_remove = on_remove
+        
+        self._sessions: Dict[str, Any] = {}
+        self._ttl: Dict[str, Optional[float]] = {}
+        # trip_id -> expiry deadline, least recently used first
+        self._expiry: "OrderedDict[str, float]" = OrderedDict()
+        
+        # user_id -> trip_ids of that user's sessions, in creation order
+        self._user_to_trips: Dict[str, List[str]] = defaultdict(list)
+        # user_id -> the user's oldest live session
+        self._active_by_user: Dict[str, Any] = {}
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def __contains__(self, trip_id: Optional[str]) -> bool:
+        return self.get(trip_id) is not None
+    
+    def get(self, trip_id: Optional[str]) -> Optional[Any]:
+        """Get a live session and refresh its expiry."""
+        session = self._sessions.get(trip_id) if trip_id else None
+        if session is None:
+            return None
+        
+        deadline = self._expiry.get(trip_id)
+        if deadline is not None:
+            now = time.monotonic()
+            if deadline <= now:
+                self.delete(trip_id)
+                return None
+            self._touch(trip_id, now)
+        
+        return session
+    
+    def set(self, session: Any, ttl_seconds: Any = _DEFAULT_TTL) -> None:
+        """Store a session, optionally overriding the default TTL."""
+        now = time.monotonic()
+        self._expire(now)
+        
+        trip_id = session.trip_id
+        if trip_id not in self._sessions:
+            self._user_to_trips[session.user_id].append(trip_id)
+            self._active_by_user.setdefault(session.user_id, session)
+        
+        self._sessions[trip_id] = session
+        self._ttl[trip_id] = self.default_ttl_seconds if ttl_seconds is _DEFAULT_TTL else ttl_seconds
+        self._expiry.pop(trip_id, None)
+        self._touch(trip_id, now)
+    
+    def delete(self, trip_id: str) -> Optional[Any]:
+        """Remove a session and drop it from the user index."""
+        session = self._sessions.pop(trip_id, None)
+        if session is None:
+            return None
+        
+        self._ttl.pop(trip_id, None)
+        self._expiry.pop(trip_id, None)
+        
+        user_id = session.user_id
+        trip_ids = self._user_to_trips.get(user_id)
+        if trip_ids:
+            trip_ids.remove(trip_id)
+            if not trip_ids:
+                del self._user_to_trips[user_id]
+        
+        if self._active_by_user.get(user_id) is session:
+            if trip_ids:
+                self._active_by_user[user_id] = self._sessions[trip_ids[0]]
+            else:
+                del self._active_by_user[user_id]
+        
+        if self._on_remove:
+            self._on_remove(session)
+        return session
+    
+    def delete_user(self, user_id: str) -> List[Any]:
+        """Remove every session belonging to a user."""
+        trip_ids = self._user_to_trips.pop(user_id, [])
+        self._active_by_user.pop(user_id, None)
+        
+        if len(trip_ids) * 2 > len(self._sessions):
+            # Removing most sessions: rebuild once instead of deleting one by one
+            removed = [self._sessions[trip_id] for trip_id in trip_ids]
+            self._sessions = {
+                trip_id: session
+                for trip_id, session in self._sessions.items()
+                if session.user_id != user_id
+            }
+        else:
+            removed = [self._sessions.pop(trip_id) for trip_id in trip_ids]
+        
+        for trip_id in trip_ids:
+            self._ttl.pop(trip_id, None)
+            self._expiry.pop(trip_id, None)
+        
+        if self._on_remove:
+            for session in removed:
+                self._on_remove(session)
+        return removed
+    
+    def first_for_user(self, user_id: Optional[str]) -> Optional[Any]:
+        """Get the first live session started by a user."""
+        while True:
+            session = self._active_by_user.get(user_id)
+            if session is None or self.get(session.trip_id) is not None:
+                return session
+    
+    def _touch(self, trip_id: str, now: float) -> None:
+        ttl_seconds = self._ttl.get(trip_id)
+        if ttl_seconds is not None:
+            self._expiry[trip_id] = now + ttl_seconds
+            self._expiry.move_to_end(trip_id)
+    
+    def _expire(self, now: float) -> None:
+        """Drop sessions whose expiry has passed, oldest first."""
+        while self._expiry:
+            trip_id, deadline = next(iter(self._expiry.items()))
+            if deadline > now:
+                break
+            self.delete(trip_id)
@@ -1,11 +1,15 @@
 import asyncio
+import io
 import logging
+import re
 from contextlib import asynccontextmanager
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime, timedelta, date
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, ValidationError
 
 from src.config.settings import settings
@@ -13,12 +17,14 @@ from src.database import db_manager
 from src.agents import agent_registry
 from src.agents.base_agent import AgentMessage
 from src.utils.gemini_client import gemini_client
+from src.utils.log_context import LOG_FORMAT, add_trip_context
 
-# Configure logging
+# Configure logging; a no-op when run_server.py has already set it up
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format=LOG_FORMAT
 )
+add_trip_context(logging.getLogger().handlers)
 logger = logging.getLogger("api_main")
 
 
@@ -26,6 +32,69 @@ logger = logging.getLogger("api_main")
 USER_ID = "1"
 
 
+# Destinations recognized by the keyword fallback, matched in a single scan
+_FALLBACK_DESTINATIONS = ("paris", "tokyo", "new york", "london", "rome", "barcelona", "amsterdam", "berlin", "prague", "vienna")
+_FALLBACK_DESTINATION_RE = re.compile("|".join(re.escape(dest) for dest in _FALLBACK_DESTINATIONS))
+
+# Food and activity keywords picked up by the keyword fallback
+_FALLBACK_FOOD_KEYWORDS = ("pizza", "sushi", "pasta", "steak", "seafood", "vegetarian", "vegan", "street food")
+_FALLBACK_ACTIVITY_KEYWORDS = ("museum", "shopping", "hiking", "beach", "culture", "history", "nightlife", "relax")
+
+# Duration keywords checked in order by the keyword fallback
+_FALLBACK_DURATIONS = (
+    (("week", "7 days"), 7),
+    (("month", "30 days"), 30),
+    (("3 days",), 3),
+    (("10 days",), 10),
+)
+
+
+# Shared read-only default for missing nested sections of a trip, instead of a new {} per lookup
+_EMPTY_MAPPING = MappingProxyType({})
+
+# Travel companions for the default profile, shared rather than rebuilt per request
+_TRAVELS_SOLO = ("solo",)
+_TRAVELS_WITH_FRIENDS = ("friends",)
+
+# Fixed lines of the chat response message
+_OVERVIEW_TEMPLATE = (
+    "## 🌍 Trip Overview\n\n"
+    "| **Field** | **Details** |\n"
+    "|-----------|-------------|\n"
+    "| **Destination** | {destination} |\n"
+    "| **Duration** | {duration} days |\n"
+    "| **Start Date** | {start_date} |\n"
+    "| **End Date** | {end_date} |\n"
+    "| **Status** | {status} |\n"
+    "| **Created** | {created_at} |\n\n"
+)
+_DAY_HEADER_TEMPLATE = (
+    "### Day {day_num}: {theme}\n\n"
+    "| **Time** | **Activity** | **Location** | **Cost** |\n"
+    "|----------|-------------|-------------|----------|\n"
+)
+_PREFERENCES_HEADER = (
+    "\n## 👤 Your Travel Preferences\n\n",
+    "| **Preference** | **Details** |\n",
+    "|---------------|-------------|\n",
+)
+_WEATHER_HEADER = (
+    "\n## 🌤️ Weather Information\n\n",
+    "| **Day** | **Condition** | **Temperature** | **Recommendations** |\n",
+    "|--------|---------------|----------------|--------------------|\n",
+)
+_NOTES_HEADER = (
+    "\n## 📝 Additional Notes\n\n",
+    "| **Category** | **Details** |\n",
+    "|-------------|-------------|\n",
+)
+_CLOSING = (
+    "\n---\n",
+    "🎯 **Your trip is ready!** Would you like me to make any adjustments to your itinerary, budget, or preferences?",
+    "\n\n</div>",
+)
+
+
 # In-memory store for user context (for demo purposes)
 # In a real application, this should be in a database or a proper session manager.
 global_user_context = ""
@@ -48,6 +117,12 @@ class ChatResponse(BaseModel):
     timestamp: datetime = datetime.utcnow()
 
 
+def _chat_response(**fields: Any) -> ORJSONResponse:
+    """Build a chat response serialized straight by orjson, datetimes and dates included."""
+    # Fields are built by this module, so skip validation and the deep copy model_dump() makes of trip_details
+    return ORJSONResponse(dict(ChatResponse.model_construct(**fields)))
+
+
 # Application lifecycle
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -80,7 +155,8 @@ app = FastAPI(
     title="AI Travel Planner API",
     description="Backend API for AI Travel Planner - An Agentic Travel Companion",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -170,7 +246,7 @@ async def chat_with_planner(chat_request: ChatRequest):
         extracted_info = await _extract_trip_information(global_user_context)
         
         if not extracted_info:
-            return ChatResponse(
+            return _chat_response(
                 success=False,
                 message="I couldn't understand your trip request. Please provide more details about where you want to go and when.",
                 error="No trip information extracted"
@@ -180,7 +256,7 @@ async def chat_with_planner(chat_request: ChatRequest):
         trip_details = await _coordinate_ai_agents(extracted_info)
         
         if not trip_details:
-            return ChatResponse(
+            return _chat_response(
                 success=False,
                 message="I encountered an error while planning your trip. Please try again.",
                 error="Failed to generate trip details"
@@ -192,7 +268,7 @@ async def chat_with_planner(chat_request: ChatRequest):
         # Step 4: Return response
         response_message = _generate_response_message(trip_details)
         global_user_context = "User question: \n" + global_user_context + "\n\n" + "User context: \n" + response_message
-        return ChatResponse(
+        return _chat_response(
             success=True,
             message=response_message,
             trip_id=trip_id,
@@ -202,13 +278,33 @@ async def chat_with_planner(chat_request: ChatRequest):
         
     except Exception as e:
         logger.error(f"CHAT API ERROR: {str(e)}")
-        return ChatResponse(
+        return _chat_response(
             success=False,
             message="I'm sorry, something went wrong. Please try again.",
             error=str(e)
         )
 
 
+# Chat History Endpoint
+@app.get("/chat/history")
+async def stream_chat_history(
+    user_id: str,
+    trip_id: Optional[str] = None,
+    cursor: Optional[int] = Query(None, ge=0),
+    size: int = Query(50, ge=1, le=200)
+):
+    """
+    Stream a user's chat history as newline-delimited JSON, optionally for a single trip.
+    
+    Pass the id of the oldest message received as `cursor` to page further back.
+    """
+    orchestrator = agent_registry.get_agent("orchestrator")
+    return StreamingResponse(
+        orchestrator.stream_chat_history(user_id, trip_id=trip_id, size=size, cursor=cursor),
+        media_type="application/x-ndjson"
+    )
+
+
 # Helper functions
 
 def _parse_date_safely(date_value: Union[str, date, datetime]) -> date:
@@ -272,40 +368,23 @@ def _simple_extraction_fallback(message: str) -> Optional[Dict[str, Any]]:
     message_lower = message.lower()
     
     # Extract destinations
-    destinations = ["paris", "tokyo", "new york", "london", "rome", "barcelona", "amsterdam", "berlin", "prague", "vienna"]
-    found_destination = None
-    for dest in destinations:
-        if dest in message_lower:
-            found_destination = dest.title()
-            break
-    
-    if not found_destination:
+    destination_match = _FALLBACK_DESTINATION_RE.search(message_lower)
+    if not destination_match:
         return None
     
+    found_destination = destination_match.group().title()
+    
     # Extract duration
-    duration_days = 5  # Default
-    if "week" in message_lower or "7 days" in message_lower:
-        duration_days = 7
-    elif "month" in message_lower or "30 days" in message_lower:
-        duration_days = 30
-    elif "3 days" in message_lower:
-        duration_days = 3
-    elif "10 days" in message_lower:
-        duration_days = 10
+    duration_days = next(
+        (days for keywords, days in _FALLBACK_DURATIONS if any(keyword in message_lower for keyword in keywords)),
+        5  # Default
+    )
     
     # Extract food preferences
-    food_preferences = []
-    food_keywords = ["pizza", "sushi", "pasta", "steak", "seafood", "vegetarian", "vegan", "street food"]
-    for food in food_keywords:
-        if food in message_lower:
-            food_preferences.append(food)
+    food_preferences = [food for food in _FALLBACK_FOOD_KEYWORDS if food in message_lower]
     
     # Extract activities
-    activities = []
-    activity_keywords = ["museum", "shopping", "hiking", "beach", "culture", "history", "nightlife", "relax"]
-    for activity in activity_keywords:
-        if activity in message_lower:
-            activities.append(activity)
+    activities = [activity for activity in _FALLBACK_ACTIVITY_KEYWORDS if activity in message_lower]
     
     # Calculate dates (30 days from now)
     start_date = datetime.now().date() + timedelta(days=30)
@@ -338,23 +417,17 @@ async def _coordinate_ai_agents(extracted_info: Dict[str, Any]) -> Optional[Dict
         # Step 1: Check if user profile exists, create if needed
         user_profile = await _ensure_user_profile(extracted_info)
         
-        # Step 2: Generate itinerary for each day
-        duration_days = extracted_info["duration_days"]
-        daily_itineraries = []
+        # Step 2: Generate itinerary for each day, all days in one batch
+        day_itineraries = await _generate_daily_itineraries(extracted_info, user_profile)
         
-        for day_number in range(1, duration_days + 1):
-            logger.info(f"COORDINATE AGENTS: Generating itinerary for day {day_number}/{duration_days}")
-            
-            # Generate itinerary for this specific day
-            day_itinerary = await _generate_daily_itinerary(extracted_info, user_profile, day_number)
-            
-            if not day_itinerary:
-                logger.error(f"COORDINATE AGENTS ERROR: Failed to generate itinerary for day {day_number}")
-                return None
-            
-            # Step 3: Critique and improve this day's itinerary
-            improved_day_itinerary = await _critique_itinerary(day_itinerary, user_profile)
-            daily_itineraries.append(improved_day_itinerary)
+        if day_itineraries is None:
+            return None
+        
+        # Step 3: Critique and improve each day's itinerary concurrently
+        daily_itineraries = list(await asyncio.gather(*(
+            _critique_itinerary(day_itinerary, user_profile)
+            for day_itinerary in day_itineraries
+        )))
         
         # Step 4: Compile trip details
         trip_details = {
@@ -367,7 +440,7 @@ async def _coordinate_ai_agents(extracted_info: Dict[str, Any]) -> Optional[Dict
             "itinerary": daily_itineraries,  # Now a list of daily itineraries
             "extracted_preferences": extracted_info,
             "status": "planned",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": datetime.utcnow()
         }
         
         return trip_details
@@ -377,109 +450,112 @@ async def _coordinate_ai_agents(extracted_info: Dict[str, Any]) -> Optional[Dict
         return None
 
 
+def _build_user_profile(interests: List[str], group_size: int) -> Dict[str, Any]:
+    """Build a default user profile for the chat user."""
+    return {
+        "user_id": USER_ID, 
+        "preferences": {
+            "travel_style": ["cultural"],  # Should be a list of TravelStyle enums
+            "pace": "moderate",
+            "interests": interests,
+            "dietary_restrictions": None,
+            "accommodation_preferences": None,
+            "transport_preferences": None,
+            "activity_preferences": None
+        }, 
+        "traveler_info": {
+            "group_size": group_size,
+            "travels_with": _TRAVELS_SOLO if group_size == 1 else _TRAVELS_WITH_FRIENDS,
+            "ages": None,
+            "accessibility_needs": None
+        },
+        "budget": {
+            "level": "mid-range",  # Default budget level
+            "currency": "USD",
+            "daily_max": None,
+            "total_max": None
+        }
+    }
+
+
 async def _ensure_user_profile(extracted_info: Dict[str, Any]) -> Dict[str, Any]:
     """Ensure user profile exists, create if needed."""
     logger.info(f"ENSURE PROFILE: Checking profile for user {USER_ID}")
     
     try:
+        orchestrator = agent_registry.get_agent("orchestrator")
+        
         # Check if profile exists in memory
-        existing_profile = agent_registry.get_agent("orchestrator").get_memory(f"user_profile_{USER_ID}", scope="user")
+        existing_profile = orchestrator.get_memory(f"user_profile_{USER_ID}", scope="user")
         
         if existing_profile:
             return existing_profile
         
         # Create new profile based on extracted info
-        profile = {
-            "user_id": USER_ID, 
-            "preferences": {
-                "travel_style": ["cultural"],  # Should be a list of TravelStyle enums
-                "pace": "moderate",
-                "interests": extracted_info.get("activities", []),
-                "dietary_restrictions": None,
-                "accommodation_preferences": None,
-                "transport_preferences": None,
-                "activity_preferences": None
-            }, 
-            "traveler_info": {
-                "group_size": int(extracted_info.get("travelers") or 1),
-                "travels_with": ["solo"] if int(extracted_info.get("travelers") or 1) == 1 else ["friends"],
-                "ages": None,
-                "accessibility_needs": None
-            },
-            "budget": {
-                "level": "mid-range",  # Default budget level
-                "currency": "USD",
-                "daily_max": None,
-                "total_max": None
-            }
-        }
+        profile = _build_user_profile(
+            extracted_info.get("activities", []),
+            int(extracted_info.get("travelers") or 1)
+        )
         
         # Store profile in memory
-        agent_registry.get_agent("orchestrator").set_memory(f"user_profile_{USER_ID}", profile, scope="user")
+        orchestrator.set_memory(f"user_profile_{USER_ID}", profile, scope="user")
         
         return profile
         
     except Exception as e:
         logger.error(f"ENSURE PROFILE ERROR: {str(e)}")
-        return {
-            "user_id": USER_ID, 
-            "preferences": {
-                "travel_style": ["cultural"],
-                "pace": "moderate",
-                "interests": [],
-                "dietary_restrictions": None,
-                "accommodation_preferences": None,
-                "transport_preferences": None,
-                "activity_preferences": None
-            }, 
-            "traveler_info": {
-                "group_size": 1,
-                "travels_with": ["solo"],
-                "ages": None,
-                "accessibility_needs": None
-            },
-            "budget": {
-                "level": "mid-range",
-                "currency": "USD",
-                "daily_max": None,
-                "total_max": None
-            }
+        return _build_user_profile([], 1)
+
+
+def _build_daily_itinerary_message(extracted_info: Dict[str, Any], user_profile: Dict[str, Any], day_number: int, start_date: date) -> AgentMessage:
+    """Build the Itinerary Agent message for a specific day."""
+    # Calculate the specific date for this day
+    day_date = start_date + timedelta(days=day_number - 1)
+    
+    return AgentMessage(
+        agent_id="api",
+        message_type="generate_itinerary",
+        content={
+            "user_profile": user_profile,
+            "destination": extracted_info["destination"],
+            "date": day_date.isoformat(),
+            "day_index": day_number,
+            "start_date": extracted_info["start_date"],
+            "end_date": extracted_info["end_date"],
+            "duration_days": extracted_info["duration_days"],
+            "preferences": extracted_info
         }
+    )
 
 
-async def _generate_daily_itinerary(extracted_info: Dict[str, Any], user_profile: Dict[str, Any], day_number: int) -> Optional[Dict[str, Any]]:
-    """Generate itinerary for a specific day using Itinerary Agent."""
-    logger.info(f"GENERATE DAILY ITINERARY: Creating itinerary for day {day_number} in {extracted_info.get('destination', 'unknown')}")
+async def _generate_daily_itineraries(extracted_info: Dict[str, Any], user_profile: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Generate the itinerary for every day of the trip in one Itinerary Agent batch."""
+    duration_days = extracted_info["duration_days"]
+    logger.info(f"GENERATE DAILY ITINERARY: Creating {duration_days} daily itineraries in {extracted_info.get('destination', 'unknown')}")
     
     try:
-        # Calculate the specific date for this day
+        # Parse the trip start once for all days
         start_date = _parse_date_safely(extracted_info["start_date"])
-        day_date = start_date + timedelta(days=day_number - 1)
-        
-        # Create message for itinerary generation
-        itinerary_message = AgentMessage(
-            agent_id="api",
-            message_type="generate_itinerary",
-            content={
-                "user_profile": user_profile,
-                "destination": extracted_info["destination"],
-                "date": day_date.isoformat(),
-                "day_index": day_number,
-                "start_date": extracted_info["start_date"],
-                "end_date": extracted_info["end_date"],
-                "duration_days": extracted_info["duration_days"],
-                "preferences": extracted_info
-            }
+        itinerary_messages = [
+            _build_daily_itinerary_message(extracted_info, user_profile, day_number, start_date)
+            for day_number in range(1, duration_days + 1)
+        ]
+        
+        # Send all days to the itinerary agent together, as many at once as the orchestrator allows
+        max_concurrent_days = agent_registry.get_agent("orchestrator").workflow_config.max_concurrent_days
+        responses = await agent_registry.send_batch(
+            "itinerary", itinerary_messages, max_concurrency=max_concurrent_days
         )
         
-        # Send to itinerary agent
-        response = await agent_registry.send_message("itinerary", itinerary_message)
+        daily_itineraries = []
+        for day_number, response in enumerate(responses, start=1):
+            day_itinerary = response.data.get("itinerary") if response.success and response.data else None
+            if not day_itinerary:
+                logger.error(f"GENERATE DAILY ITINERARY ERROR: Failed to generate itinerary for day {day_number}: {response.error}")
+                return None
+            daily_itineraries.append(day_itinerary)
         
-        if response.success:
-            return response.data.get("itinerary")
-        else:
-            logger.error(f"GENERATE DAILY ITINERARY ERROR: {response.error}")
-            return None
+        return daily_itineraries
             
     except Exception as e:
         logger.error(f"GENERATE DAILY ITINERARY ERROR: {str(e)}")
@@ -590,9 +666,11 @@ async def _store_trip_details(trip_details: Dict[str, Any]) -> str:
     """Store trip details in database."""
     logger.info(f"STORE TRIP: Storing trip details for destination '{trip_details.get('destination', 'unknown')}'")
     
+    # Generate trip ID from the creation time stamped by the coordinator, read once per request
+    created_at = trip_details.get("created_at") or datetime.utcnow()
+    trip_id = f"trip_{USER_ID}_{int(created_at.timestamp())}"
+    
     try:
-        # Generate trip ID
-        trip_id = f"trip_{USER_ID}_{int(datetime.utcnow().timestamp())}"
         trip_details["trip_id"] = trip_id
         
         # Store in database
@@ -606,8 +684,39 @@ async def _store_trip_details(trip_details: Dict[str, Any]) -> str:
             
     except Exception as e:
         logger.error(f"STORE TRIP ERROR: {str(e)}")
-        # Return a generated ID even if storage fails
-        return f"trip_{USER_ID}_{int(datetime.utcnow().timestamp())}"
+        # Return the generated ID even if storage fails
+        return trip_id
+
+
+def _format_activity_time(start_time: Any) -> str:
+    """Format an activity start time as HH:MM."""
+    if not start_time or start_time == "TBD":
+        return "TBD"
+    
+    # ISO timestamps (YYYY-MM-DDTHH:MM...) are sliced directly
+    if isinstance(start_time, str) and len(start_time) >= 16 and start_time[10] == "T":
+        return start_time[11:16]
+    
+    try:
+        # Handle both datetime objects and other strings
+        if isinstance(start_time, str):
+            return start_time.split("T")[1][:5] if "T" in start_time else start_time
+        return start_time.strftime("%H:%M") if hasattr(start_time, 'strftime') else str(start_time)
+    except (ValueError, TypeError):
+        return "TBD"
+
+
+def _format_cost(cost: Any) -> str:
+    """Format an activity cost in dollars, or "Free"."""
+    # Missing and zero costs are the common case
+    if not cost:
+        return "Free"
+    
+    try:
+        cost = float(cost)
+    except (ValueError, TypeError):
+        return "Free"
+    return f"${cost:.2f}" if cost > 0 else "Free"
 
 
 def _generate_response_message(trip_details: Dict[str, Any]) -> str:
@@ -618,66 +727,45 @@ def _generate_response_message(trip_details: Dict[str, Any]) -> str:
     duration = trip_details.get("duration_days", 0)
     
     # Create comprehensive trip details table wrapped in scrollable div
-    message = f'<div style="overflow-x: auto;">\n\nGreat! I\'ve planned your {duration}-day trip to {destination}. Here\'s your complete travel plan:\n\n'
-    
-    # Trip Overview Table
-    message += "## 🌍 Trip Overview\n\n"
-    message += "| **Field** | **Details** |\n"
-    message += "|-----------|-------------|\n"
-    message += f"| **Destination** | {destination} |\n"
-    message += f"| **Duration** | {duration} days |\n"
-    message += f"| **Start Date** | {trip_details.get('start_date', 'Not specified')} |\n"
-    message += f"| **End Date** | {trip_details.get('end_date', 'Not specified')} |\n"
-    message += f"| **Status** | {trip_details.get('status', 'Planned').title()} |\n"
-    message += f"| **Created** | {trip_details.get('created_at', 'Now')} |\n\n"
+    buf = io.StringIO()
+    buf.write(f'<div style="overflow-x: auto;">\n\nGreat! I\'ve planned your {duration}-day trip to {destination}. Here\'s your complete travel plan:\n\n')
+    
+    # Trip Overview Table; created_at is kept as a datetime, so render it as ISO like before
+    created_at = trip_details.get("created_at", "Now")
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    buf.write(_OVERVIEW_TEMPLATE.format_map({
+        "destination": destination,
+        "duration": duration,
+        "start_date": trip_details.get("start_date", "Not specified"),
+        "end_date": trip_details.get("end_date", "Not specified"),
+        "status": trip_details.get("status", "Planned").title(),
+        "created_at": created_at
+    }))
     
     # Itinerary Details Table
     itinerary = trip_details.get("itinerary", []) # Itinerary is now a list of daily itineraries
     if itinerary:
-        message += "## 📅 Daily Itinerary\n\n"
+        buf.write("## 📅 Daily Itinerary\n\n")
         
         for day_num, day_itinerary in enumerate(itinerary, 1):
-            message += f"### Day {day_num}: {day_itinerary.get('theme', 'Exploring')}\n\n"
-            message += "| **Time** | **Activity** | **Location** | **Cost** |\n"
-            message += "|----------|-------------|-------------|----------|\n"
+            buf.write(_DAY_HEADER_TEMPLATE.format(day_num=day_num, theme=day_itinerary.get("theme", "Exploring")))
             
-            activities = day_itinerary.get("activities", [])
+            activities = day_itinerary.get("activities", ())
             if activities:
                 for activity in activities:
-                    start_time = activity.get("start_time", "TBD")
-                    if start_time and start_time != "TBD":
-                        try:
-                            # Handle both datetime objects and strings
-                            if isinstance(start_time, str):
-                                time_str = start_time.split("T")[1][:5] if "T" in start_time else start_time
-                            else:
-                                time_str = start_time.strftime("%H:%M") if hasattr(start_time, 'strftime') else str(start_time)
-                        except:
-                            time_str = "TBD"
-                    else:
-                        time_str = "TBD"
+                    time_str = _format_activity_time(activity.get("start_time", "TBD"))
                     
                     name = activity.get("name", "Activity")
-                    activity_type = activity.get("type", "Unknown")  # Keep in background
-                    location = activity.get("location", {}).get("name", "Location TBD")
-                    duration = f"{activity.get('duration_minutes', 0)} min" if activity.get('duration_minutes') else "TBD"  # Keep in background
+                    location = activity.get("location", _EMPTY_MAPPING).get("name", "Location TBD")
                     
-                    # Safely handle cost calculation
-                    try:
-                        activity_cost = float(activity.get('cost', 0) or 0)
-                        cost = f"${activity_cost:.2f}" if activity_cost > 0 else "Free"
-                    except (ValueError, TypeError):
-                        cost = "Free"
+                    cost = _format_cost(activity.get('cost'))
                     
-                    message += f"| {time_str} | {name} | {location} | {cost} |\n"
+                    buf.write("| " + " | ".join((time_str, name, location, cost)) + " |\n")
         
-        message += "\n"
+        buf.write("\n")
     
     # Budget Summary
-    message += "## 💰 Budget Summary\n\n"
-    message += "| **Category** | **Amount** |\n"
-    message += "|-------------|------------|\n"
-    
     # Calculate total cost from all daily itineraries
     total_cost = 0.0
     try:
@@ -704,63 +792,60 @@ def _generate_response_message(trip_details: Dict[str, Any]) -> str:
     max_cost = max(total_cost, estimated_cost)
     daily_average = max_cost / duration_num if duration_num > 0 else 0
     
-    message += f"| **Estimated Total** | {budget_currency} {max_cost:.2f} |\n"
-    message += f"| **Daily Average** | {budget_currency} {daily_average:.2f} |\n"
+    buf.write(
+        "## 💰 Budget Summary\n\n"
+        "| **Category** | **Amount** |\n"
+        "|-------------|------------|\n"
+        f"| **Estimated Total** | {budget_currency} {max_cost:.2f} |\n"
+        f"| **Daily Average** | {budget_currency} {daily_average:.2f} |\n"
+    )
     
     # User preferences summary
-    user_profile = trip_details.get("user_profile", {})
+    user_profile = trip_details.get("user_profile", _EMPTY_MAPPING)
     if user_profile:
-        message += "\n## 👤 Your Travel Preferences\n\n"
-        message += "| **Preference** | **Details** |\n"
-        message += "|---------------|-------------|\n"
+        buf.writelines(_PREFERENCES_HEADER)
         
-        preferences = user_profile.get("preferences", {})
-        traveler_info = user_profile.get("traveler_info", {})
-        budget_info = user_profile.get("budget", {})
+        preferences = user_profile.get("preferences", _EMPTY_MAPPING)
+        traveler_info = user_profile.get("traveler_info", _EMPTY_MAPPING)
+        budget_info = user_profile.get("budget", _EMPTY_MAPPING)
         
         if preferences.get("travel_style"):
-            message += f"| **Travel Style** | {', '.join(preferences['travel_style'])} |\n"
+            buf.write(f"| **Travel Style** | {', '.join(preferences['travel_style'])} |\n")
         if preferences.get("pace"):
-            message += f"| **Pace** | {preferences['pace'].title()} |\n"
+            buf.write(f"| **Pace** | {preferences['pace'].title()} |\n")
         if preferences.get("interests"):
-            message += f"| **Interests** | {', '.join(preferences['interests'])} |\n"
+            buf.write(f"| **Interests** | {', '.join(preferences['interests'])} |\n")
         if traveler_info.get("group_size"):
-            message += f"| **Group Size** | {traveler_info['group_size']} |\n"
+            buf.write(f"| **Group Size** | {traveler_info['group_size']} |\n")
         if budget_info.get("level"):
-            message += f"| **Budget Level** | {budget_info['level'].title()} |\n"
+            buf.write(f"| **Budget Level** | {budget_info['level'].title()} |\n")
     
     # Weather Information
     weather_info = trip_details.get("weather_info")
     if weather_info:
-        message += "\n## 🌤️ Weather Information\n\n"
-        message += "| **Day** | **Condition** | **Temperature** | **Recommendations** |\n"
-        message += "|--------|---------------|----------------|--------------------|\n"
+        buf.writelines(_WEATHER_HEADER)
         
         # Handle different weather data formats
         if isinstance(weather_info, dict):
             temp = weather_info.get("temperature", "Unknown")
             condition = weather_info.get("condition", "Unknown")
-            message += f"| All Days | {condition} | {temp} | Check local forecast |\n"
+            buf.write(f"| All Days | {condition} | {temp} | Check local forecast |\n")
     
     # Additional Information
-    extracted_info = trip_details.get("extracted_preferences", {})
+    extracted_info = trip_details.get("extracted_preferences", _EMPTY_MAPPING)
     if extracted_info:
-        message += "\n## 📝 Additional Notes\n\n"
-        message += "| **Category** | **Details** |\n"
-        message += "|-------------|-------------|\n"
+        buf.writelines(_NOTES_HEADER)
         
         if extracted_info.get("dietary_restrictions"):
-            message += f"| **Dietary Needs** | {extracted_info['dietary_restrictions']} |\n"
+            buf.write(f"| **Dietary Needs** | {extracted_info['dietary_restrictions']} |\n")
         if extracted_info.get("accessibility_needs"):
-            message += f"| **Accessibility** | {extracted_info['accessibility_needs']} |\n"
+            buf.write(f"| **Accessibility** | {extracted_info['accessibility_needs']} |\n")
         if extracted_info.get("special_requests"):
-            message += f"| **Special Requests** | {extracted_info['special_requests']} |\n"
+            buf.write(f"| **Special Requests** | {extracted_info['special_requests']} |\n")
     
-    message += "\n---\n"
-    message += "🎯 **Your trip is ready!** Would you like me to make any adjustments to your itinerary, budget, or preferences?"
-    message += "\n\n</div>"
+    buf.writelines(_CLOSING)
     
-    return message
+    return buf.getvalue()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,27 @@
+import asyncio
 import googlemaps
+import orjson
 import requests
 import base64
-from typing import Dict, Any, List, Optional, Union
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Union
 from datetime import datetime
 import os
+import time
 from src.tools.base_mcp_tool import BaseMCPTool, MCPToolResponse, MCPToolError
 from src.config.settings import settings
 from src.models.trip import Location
 
 
+# Shared stand-in for missing opening hours lists; never mutated
+_EMPTY_TUPLE = ()
+
+# How long nearby search results are reused
+_NEARBY_CACHE_TTL_SECONDS = 3600
+# Caches drop their oldest entry once they grow past this size
+_CACHE_MAX_ENTRIES = 1024
+
+
 class GoogleMapsTool(BaseMCPTool):
     """
     Comprehensive Google Maps Platform MCP tool supporting:
@@ -33,6 +46,16 @@ class GoogleMapsTool(BaseMCPTool):
         # Initialize Google Maps client
         self.gmaps = googlemaps.Client(key=self.api_key) if self.api_key else None
         
+        # Bounds concurrent nearby searches so batched fan-outs stay under the
+        # Places QPS quota instead of tripping OVER_QUERY_LIMIT retries
+        self.places_semaphore = asyncio.Semaphore(5)
+        
+        # Nearby search results by ~1 km grid cell and search parameters, shared by
+        # every agent using the tool, oldest first: (fetched_at, places)
+        self._nearby_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Geocoded location queries, oldest first: normalized query -> (latitude, longitude)
+        self._coordinates_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        
         # Base URLs for different APIs
         self.base_urls = {
             "places": "https://maps.googleapis.com/maps/api/place",
@@ -67,7 +90,8 @@ class GoogleMapsTool(BaseMCPTool):
                         "search_location", "geocode", "reverse_geocode", "address_validation",
                         
                         # Places API
-                        "search_places", "find_nearby_places", "place_details", "place_photos",
+                        "search_places", "find_nearby_places", "find_nearby_places_batch",
+                        "place_details", "place_photos",
                         "place_reviews", "place_autocomplete",
                         
                         # Routes & Navigation
@@ -155,6 +179,16 @@ class GoogleMapsTool(BaseMCPTool):
                     "type": "string",
                     "description": "Type of place to search for (restaurant, lodging, tourist_attraction, etc.)"
                 },
+                "place_types": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Place types to search for around one location (find_nearby_places_batch)"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Place result fields to return for nearby searches (default: all)"
+                },
                 "keyword": {
                     "type": "string",
                     "description": "Keyword to match against place names and types"
@@ -265,7 +299,7 @@ class GoogleMapsTool(BaseMCPTool):
             return "origin" in params and "destination" in params
         
         # Search-based actions
-        search_actions = ["search_places", "find_nearby_places", "place_autocomplete"]
+        search_actions = ["search_places", "find_nearby_places", "find_nearby_places_batch", "place_autocomplete"]
         if action in search_actions:
             return ("latitude" in params and "longitude" in params) or "query" in params
         
@@ -299,6 +333,8 @@ class GoogleMapsTool(BaseMCPTool):
                 return await self._search_places(kwargs)
             elif action == "find_nearby_places":
                 return await self._find_nearby_places(kwargs)
+            elif action == "find_nearby_places_batch":
+                return await self._find_nearby_places_batch(kwargs)
             elif action == "place_details":
                 return await self._get_place_details(kwargs)
             elif action == "place_photos":
@@ -526,6 +562,7 @@ class GoogleMapsTool(BaseMCPTool):
             open_now = params.get("open_now", False)
             min_price = params.get("min_price")
             max_price = params.get("max_price")
+            fields = params.get("fields")
             
             # Search for nearby places
             search_params = {
@@ -545,12 +582,34 @@ class GoogleMapsTool(BaseMCPTool):
             if max_price is not None:
                 search_params["max_price"] = max_price
             
-            places_result = self.gmaps.places_nearby(**search_params)
-            
-            places = []
-            for place in places_result.get("results", []):
-                place_info = self._format_place_result(place)
-                places.append(place_info)
+            # Open-now results go stale within the hour, so they are never cached
+            cache_key = None
+            if not open_now:
+                cache_key = (
+                    round(location[0], 2), round(location[1], 2), radius, place_type, keyword,
+                    language, min_price, max_price, tuple(fields) if fields is not None else None
+                )
+            
+            now = time.monotonic()
+            cached = self._nearby_cache.get(cache_key) if cache_key else None
+            if cached and now - cached[0] < _NEARBY_CACHE_TTL_SECONDS:
+                # Copies, so callers adding fields to a place don't change the cached entry
+                places = [dict(place) for place in cached[1]]
+            else:
+                # The client is blocking; run it off the event loop so lookups can overlap
+                async with self.places_semaphore:
+                    places_result = await asyncio.to_thread(self.gmaps.places_nearby, **search_params)
+                
+                places = [
+                    self._format_place_result(place, fields)
+                    for place in places_result.get("results", [])
+                ]
+                
+                if cache_key:
+                    self._nearby_cache[cache_key] = (now, [dict(place) for place in places])
+                    self._nearby_cache.move_to_end(cache_key)
+                    if len(self._nearby_cache) > _CACHE_MAX_ENTRIES:
+                        self._nearby_cache.popitem(last=False)
             
             return self._handle_success({
                 "location": {
@@ -567,6 +626,49 @@ class GoogleMapsTool(BaseMCPTool):
         except Exception as e:
             return self._handle_error(f"Nearby places search failed: {str(e)}")
     
+    async def _find_nearby_places_batch(self, params: Dict[str, Any]) -> MCPToolResponse:
+        """Find nearby places for several place types around one location."""
+        try:
+            # Resolve the location once instead of geocoding it for every type
+            location = await self._get_location_coordinates(params)
+            if not location:
+                return self._handle_error("Could not determine location")
+            
+            place_types = list(dict.fromkeys(params.get("place_types") or []))
+            type_params = {
+                key: value for key, value in params.items()
+                if key not in ("query", "place_types", "place_type")
+            }
+            type_params["latitude"], type_params["longitude"] = location
+            
+            responses = await asyncio.gather(*(
+                self._find_nearby_places({**type_params, "place_type": place_type})
+                for place_type in place_types
+            ))
+            
+            places_by_type = {}
+            errors = {}
+            for place_type, response in zip(place_types, responses):
+                if response.success:
+                    places_by_type[place_type] = response.data["places"]
+                else:
+                    places_by_type[place_type] = []
+                    errors[place_type] = response.error
+            
+            return self._handle_success({
+                "location": {
+                    "latitude": location[0],
+                    "longitude": location[1]
+                },
+                "radius": params.get("radius", 1000),
+                "places_by_type": places_by_type,
+                "errors": errors,
+                "total_results": sum(len(places) for places in places_by_type.values())
+            })
+            
+        except Exception as e:
+            return self._handle_error(f"Batch nearby places search failed: {str(e)}")
+    
     async def _get_place_details(self, params: Dict[str, Any]) -> MCPToolResponse:
         """Get detailed information about a place."""
         try:
@@ -1571,12 +1673,25 @@ class GoogleMapsTool(BaseMCPTool):
         if "latitude" in params and "longitude" in params:
             return (params["latitude"], params["longitude"])
         elif "query" in params:
-            geocode_result = self.gmaps.geocode(params["query"])
+            query_key = params["query"].strip().lower()
+            coordinates = self._coordinates_cache.get(query_key)
+            if coordinates:
+                return coordinates
+            
+            geocode_result = await asyncio.to_thread(self.gmaps.geocode, params["query"])
             if geocode_result:
                 location = geocode_result[0]["geometry"]["location"]
-                return (location["lat"], location["lng"])
+                coordinates = self._coordinates_cache[query_key] = (location["lat"], location["lng"])
+                if len(self._coordinates_cache) > _CACHE_MAX_ENTRIES:
+                    self._coordinates_cache.popitem(last=False)
+                return coordinates
         return None
     
+    def cache_clear(self):
+        """Drop cached nearby search results and geocoded locations."""
+        self._nearby_cache.clear()
+        self._coordinates_cache.clear()
+    
     async def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling."""
         try:
@@ -1593,7 +1708,8 @@ class GoogleMapsTool(BaseMCPTool):
             response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
             
-            return response.json()
+            # orjson.JSONDecodeError is a ValueError, handled below
+            return orjson.loads(response.content)
             
         except requests.exceptions.RequestException as e:
             # Log the response details for debugging
@@ -1612,10 +1728,32 @@ class GoogleMapsTool(BaseMCPTool):
         except ValueError as e:
             raise Exception(f"Invalid JSON response: {e}")
     
-    def _format_place_result(self, place: Dict[str, Any]) -> Dict[str, Any]:
-        """Format a place result from Google Maps API."""
+    def _format_place_result(self, place: Dict[str, Any], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """Format a place result from Google Maps API, optionally limited to `fields`."""
         location = place.get("geometry", {}).get("location", {})
         
+        if fields is not None:
+            # Only build what the caller reads; photo URLs and hours are the costly parts
+            formatted = {}
+            for field in fields:
+                if field == "latitude":
+                    formatted[field] = location.get("lat")
+                elif field == "longitude":
+                    formatted[field] = location.get("lng")
+                elif field == "formatted_address":
+                    formatted[field] = place.get("formatted_address", place.get("vicinity", ""))
+                elif field == "opening_hours":
+                    formatted[field] = self._format_opening_hours(place.get("opening_hours"))
+                elif field == "photos":
+                    formatted[field] = self._format_photos(place.get("photos", []))
+                elif field in ("name", "place_id"):
+                    formatted[field] = place.get(field, "")
+                elif field == "types":
+                    formatted[field] = place.get("types", [])
+                else:
+                    formatted[field] = place.get(field)
+            return formatted
+        
         return {
             "name": place.get("name", ""),
             "place_id": place.get("place_id", ""),
@@ -1684,24 +1822,35 @@ class GoogleMapsTool(BaseMCPTool):
         if not opening_hours:
             return None
         
+        periods = opening_hours.get("periods")
+        weekday_text = opening_hours.get("weekday_text")
+        open_now = opening_hours.get("open_now")
+        if open_now is None and not periods and not weekday_text:
+            return None
+        
         return {
-            "open_now": opening_hours.get("open_now"),
-            "periods": opening_hours.get("periods", []),
-            "weekday_text": opening_hours.get("weekday_text", [])
+            "open_now": open_now,
+            "periods": periods or _EMPTY_TUPLE,
+            "weekday_text": weekday_text or _EMPTY_TUPLE
         }
     
     def _format_photos(self, photos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format photos information."""
         formatted_photos = []
+        if not photos:
+            return formatted_photos
+        
+        photo_url_prefix = f"{self.base_urls['places']}/photo?photoreference="
+        photo_url_suffix = f"&maxwidth=800&key={self.api_key}"
         
         for photo in photos[:5]:  # Limit to 5 photos
-            photo_url = f"{self.base_urls['places']}/photo?photoreference={photo.get('photo_reference')}&maxwidth=800&key={self.api_key}"
+            photo_reference = photo.get("photo_reference")
             
             formatted_photos.append({
-                "photo_reference": photo.get("photo_reference"),
+                "photo_reference": photo_reference,
                 "width": photo.get("width"),
                 "height": photo.get("height"),
-                "photo_url": photo_url,
+                "photo_url": f"{photo_url_prefix}{photo_reference}{photo_url_suffix}",
                 "attributions": photo.get("html_attributions", [])
             })
         
@@ -5,5 +5,6 @@ This module contains utility functions and classes for the AI Travel Planner.
 """
 
 from .gemini_client import GeminiClient, gemini_client
+from .log_context import current_trip_id, TripContextFilter
 
-__all__ = ["GeminiClient", "gemini_client"] 
\ No newline at end of file
+__all__ = ["GeminiClient", "gemini_client", "current_trip_id", "TripContextFilter"] 
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Logging context for AI Travel Planner
+
+This module carries request-scoped identifiers, such as the trip being
+planned, into log records so messages don't have to format them inline.
+"""
+
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Trip currently being handled by the running task
+current_trip_id: ContextVar[Optional[str]] = ContextVar("current_trip_id", default=None)
+
+# Log format for handlers carrying TripContextFilter
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(trip_id)s] %(message)s'
+
+
+class TripContextFilter(logging.Filter):
+    """Attach the current trip_id to every log record."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trip_id = current_trip_id.get() or "-"
+        return True
+
+
+def add_trip_context(handlers) -> None:
+    """Attach TripContextFilter to handlers that don't already have it."""
+    for handler in handlers:
+        if not any(isinstance(f, TripContextFilter) for f in handler.filters):
+            handler.addFilter(TripContextFilter())
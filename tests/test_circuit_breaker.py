@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+
+from src.agents import circuit_breaker
+from src.agents.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+def make_breaker(**kwargs):
+    kwargs.setdefault("min_calls", 4)
+    kwargs.setdefault("open_seconds", 30.0)
+    kwargs.setdefault("max_open_seconds", 100.0)
+    return CircuitBreaker("test", **kwargs)
+
+
+def record_calls(breaker, outcomes):
+    for failed in outcomes:
+        assert breaker.allow_request()
+        breaker.record(failed=failed)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True, True, True])
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_opens_when_failure_rate_exceeds_threshold(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [False, True, True, True])
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.times_opened == 1
+
+
+def test_stays_closed_at_threshold(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [False, False, True, True])
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_failures_outside_window_are_forgotten(clock):
+    breaker = make_breaker(window_seconds=10.0)
+    record_calls(breaker, [True, True, True])
+    clock.advance(11)
+    record_calls(breaker, [False, True])
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_open_circuit_rejects_until_open_period_ends(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+
+    clock.advance(29)
+    assert not breaker.allow_request()
+    assert breaker.rejections == 1
+
+    clock.advance(2)
+    assert breaker.allow_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+    clock.advance(30)
+
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_closes_and_resets(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+    clock.advance(30)
+
+    assert breaker.allow_request()
+    breaker.record(failed=False)
+    assert breaker.state is CircuitState.CLOSED
+
+    # Earlier failures no longer count toward reopening
+    record_calls(breaker, [True, False, False, False])
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_failed_trial_reopens_for_longer_up_to_max(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+
+    for expected_open in (60, 100, 100):
+        clock.advance(100)
+        assert breaker.allow_request()
+        breaker.record(failed=True)
+        assert breaker.state is CircuitState.OPEN
+
+        clock.advance(expected_open - 1)
+        assert not breaker.allow_request()
+        clock.advance(1)
+
+    assert breaker.allow_request()
+
+
+def test_metrics_include_open_time(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+    clock.advance(12)
+
+    metrics = breaker.metrics()
+    assert metrics["state"] == "open"
+    assert metrics["times_opened"] == 1
+    assert metrics["attempts"] == 4
+    assert metrics["open_seconds"] == 12
+
+
+def test_call_records_exceptions_and_reraises():
+    breaker = make_breaker(min_calls=1)
+
+    async def fail():
+        raise TimeoutError
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(breaker.call(fail))
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.call(fail))
+
+
+def test_call_only_counts_results_flagged_by_is_failure():
+    breaker = make_breaker(min_calls=1)
+
+    async def respond(value):
+        return value
+
+    assert asyncio.run(breaker.call(respond, "error")) == "error"
+    assert breaker.state is CircuitState.CLOSED
+
+    for _ in range(2):
+        asyncio.run(breaker.call(respond, "error", is_failure=lambda result: result == "error"))
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_cancelled_trial_frees_the_half_open_slot(clock):
+    breaker = make_breaker()
+    record_calls(breaker, [True] * 4)
+    clock.advance(30)
+
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(breaker.call(cancelled))
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
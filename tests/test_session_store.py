@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+
+import pytest
+
+from src.agents import session_store
+from src.agents.session_store import SessionStore
+
+
+@dataclass
+class Session:
+    trip_id: str
+    user_id: str
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(session_store.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def removed():
+    return []
+
+
+@pytest.fixture
+def store(clock, removed):
+    return SessionStore(default_ttl_seconds=60, on_remove=removed.append)
+
+
+def test_set_and_get(store):
+    session = Session("trip_1", "user_1")
+    store.set(session)
+
+    assert store.get("trip_1") is session
+    assert "trip_1" in store
+    assert len(store) == 1
+    assert store.get("missing") is None
+    assert store.get(None) is None
+
+
+def test_session_expires_after_ttl(store, clock, removed):
+    session = Session("trip_1", "user_1")
+    store.set(session)
+
+    clock.advance(60)
+    assert store.get("trip_1") is None
+    assert removed == [session]
+    assert store.first_for_user("user_1") is None
+
+
+def test_reads_refresh_expiry(store, clock):
+    store.set(Session("trip_1", "user_1"))
+
+    clock.advance(50)
+    assert store.get("trip_1") is not None
+    clock.advance(50)
+    assert store.get("trip_1") is not None
+
+
+def test_session_without_ttl_never_expires(store, clock):
+    store.set(Session("trip_1", "user_1"), ttl_seconds=None)
+
+    clock.advance(10_000)
+    assert store.get("trip_1") is not None
+
+
+def test_resetting_ttl_to_none_clears_expiry(store, clock):
+    session = Session("trip_1", "user_1")
+    store.set(session)
+    store.set(session, ttl_seconds=None)
+
+    clock.advance(10_000)
+    assert store.get("trip_1") is session
+
+
+def test_set_sweeps_expired_sessions(store, clock, removed):
+    expired = Session("trip_1", "user_1")
+    store.set(expired)
+
+    clock.advance(61)
+    store.set(Session("trip_2", "user_2"))
+    assert len(store) == 1
+    assert removed == [expired]
+
+
+def test_first_for_user_returns_oldest_live_session(store, clock):
+    first = Session("trip_1", "user_1")
+    second = Session("trip_2", "user_1")
+    store.set(first)
+    clock.advance(30)
+    store.set(second)
+
+    # The oldest session expires; the next one takes its place
+    clock.advance(31)
+    assert store.first_for_user("user_1") is second
+
+
+def test_delete_moves_active_session_to_next(store, removed):
+    first = Session("trip_1", "user_1")
+    second = Session("trip_2", "user_1")
+    store.set(first)
+    store.set(second)
+    assert store.first_for_user("user_1") is first
+
+    assert store.delete("trip_1") is first
+    assert store.first_for_user("user_1") is second
+    assert removed == [first]
+
+    assert store.delete("trip_1") is None
+    assert removed == [first]
+
+
+def test_delete_user_removes_only_that_users_sessions(store, removed):
+    store.set(Session("trip_1", "user_1"))
+    store.set(Session("trip_2", "user_2"))
+    store.set(Session("trip_3", "user_2"))
+
+    deleted = store.delete_user("user_1")
+
+    assert [s.trip_id for s in deleted] == ["trip_1"]
+    assert removed == deleted
+    assert len(store) == 2
+    assert store.get("trip_1") is None
+    assert store.first_for_user("user_1") is None
+    assert store.first_for_user("user_2").trip_id == "trip_2"
+
+
+def test_delete_user_with_most_sessions_rebuilds_store(store, clock, removed):
+    kept = Session("trip_3", "user_2")
+    store.set(Session("trip_1", "user_1"))
+    store.set(Session("trip_2", "user_1"))
+    store.set(kept)
+
+    store.delete_user("user_1")
+
+    assert len(store) == 1
+    assert store.first_for_user("user_2") is kept
+    # Dropped sessions no longer take part in expiry
+    clock.advance(61)
+    store.set(Session("trip_4", "user_3"))
+    assert removed[-1] is kept